@@ -1,140 +1,336 @@
 import httpx
-from datetime import datetime
+import asyncio
+import functools
+import math
+import time
+import orjson
+import unicodedata
+from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from app.config import config
 from app.utils.logger import logger
 from app.utils.retry import retry_with_backoff
+from app.utils.http import PayloadMemo, SharedAsyncClient
+
+# Stable 64-bit headline hashing: xxhash's XXH3 when installed, blake2b otherwise.
+# Both give the same key for the same title in every process, unlike hash()
+try:
+    import xxhash
+    _hash64 = xxhash.xxh3_64_intdigest
+except ImportError:
+    import hashlib
+
+    def _hash64(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+@functools.cache
+def _punct_table() -> dict:
+    """
+    Translate table mapping every non-word character to a space when normalizing
+    headlines: exactly what the \\W+ regex stripped (anything but str.isalnum() and "_",
+    so punctuation, symbols, combining marks and whitespace) across the Basic Multilingual
+    Plane and the emoji blocks. Other astral code points pass through. Built on first
+    use, so processes that never dedup headlines don't pay the ~7ms scan.
+    """
+    return {
+        cp: " "
+        for cp in chain(range(0x10000), range(0x1F000, 0x1FC00))
+        if not (chr(cp).isalnum() or cp == 0x5F)
+    }
+
+def _parse_pub_ts(pub_date: str) -> Optional[float]:
+    """Epoch seconds for an article's ISO 8601 pub_date, or None if missing or unparseable."""
+    if not pub_date:
+        return None
+    try:
+        return datetime.fromisoformat(pub_date.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
 
 class NewsDataHubClient:
     BASE_URL = "https://api.newsdatahub.com/v1"
 
+    # Query params that are the same for every news request
+    STATIC_PARAMS = MappingProxyType({
+        "language": "en",
+        "topic": "business,economy,finance",
+        "start_date": "2025-12-01",
+        "search_in": "title",
+        "sort_by": "date",
+    })
+
     def __init__(self):
         self.api_key = config.NEWSDATAHUB_API_KEY
         self.quota_remaining = None
         self.quota_limit = None
         self.quota_reset = None
+        self._http = SharedAsyncClient(headers={"x-api-key": self.api_key})
+        # Proactive pacing when quota runs low (seconds between calls)
+        self._min_interval = 0.0
+        self._last_call = 0.0
+        # Deduplicated articles per ticker, reused while both pages come back byte-identical
+        self._deduplicated = PayloadMemo()
 
     @retry_with_backoff(retry_on=(httpx.HTTPError,))
     async def get_news(self, ticker: str) -> dict:
         """Fetch news articles for a ticker using company name search."""
         # Get the search term for this ticker (company name instead of ticker symbol)
-        search_term = config.TICKER_INFO.get(ticker, {}).get("search_term", ticker)
+        search_term = config.SEARCH_TERMS.get(ticker, ticker)
+
+        await self._pace()
 
         url = f"{self.BASE_URL}/news"
-        base_params = {
-            "language": "en",
-            "topic": "business,economy,finance",
-            "start_date": "2025-12-01",
-            "q": search_term,
-            "search_in": "title",
-            "sort_by": "date",
-            "per_page": config.NEWS_FETCH_COUNT,
-        }
-        headers = {"x-api-key": self.api_key}
+        params = {**self.STATIC_PARAMS, "q": search_term, "per_page": config.NEWS_FETCH_COUNT}
 
         all_articles = []
+        client = self._http.get()
 
-        async with httpx.AsyncClient(timeout=config.REQUEST_TIMEOUT) as client:
-            # Fetch page 1
-            start_time = datetime.now()
-            params = base_params.copy()
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
+        # Fetch page 1
+        start_time = time.perf_counter()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        payloads = [response.content]
+
+        data = orjson.loads(response.content)
+        all_articles.extend(data.get("data", []))
+        next_cursor = data.get("next_cursor")
 
-            data = response.json()
+        # Fetch page 2 if cursor exists
+        if next_cursor:
+            params["cursor"] = next_cursor
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            payloads.append(response.content)
+            data = orjson.loads(response.content)
             all_articles.extend(data.get("data", []))
-            next_cursor = data.get("next_cursor")
 
-            # Fetch page 2 if cursor exists
-            if next_cursor:
-                params["cursor"] = next_cursor
-                response = await client.get(url, params=params, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                all_articles.extend(data.get("data", []))
+        elapsed = (time.perf_counter() - start_time) * 1000
 
-            elapsed = (datetime.now() - start_time).total_seconds() * 1000
+        # Extract quota headers from last response
+        self._update_quota_from_headers(response.headers)
 
-            # Extract quota headers from last response
-            self._update_quota_from_headers(response.headers)
+        # Dedup is pure-Python CPU work; skip it when the pages are unchanged since the last
+        # call, otherwise run it in a thread so concurrent requests keep progressing
+        digest = PayloadMemo.digest(*payloads)
+        articles = self._deduplicated.get(ticker, digest)
+        if articles is None:
+            articles = self._deduplicated.put(
+                ticker, digest,
+                await asyncio.to_thread(self._deduplicate_articles, all_articles, search_term),
+            )
 
-            articles = self._deduplicate_articles(all_articles, search_term)
+        logger.info(
+            f"NDH | Quota: {self.quota_limit - self.quota_remaining}/{self.quota_limit} used | "
+            f"Remaining: {self.quota_remaining} | "
+            f"Ticker: {ticker} (search: '{search_term}') | "
+            f"Pages: 2 | Response time: {elapsed:.0f}ms"
+        )
+        logger.info(
+            f"NDH | Dedup: {len(all_articles)} fetched → "
+            f"{len(articles)} after dedup"
+        )
 
-            logger.info(
-                f"NDH | Quota: {self.quota_limit - self.quota_remaining}/{self.quota_limit} used | "
-                f"Remaining: {self.quota_remaining} | "
-                f"Ticker: {ticker} (search: '{search_term}') | "
-                f"Pages: 2 | Response time: {elapsed:.0f}ms"
-            )
-            logger.info(
-                f"NDH | Dedup: {len(all_articles)} fetched → "
-                f"{len(articles)} after dedup"
-            )
+        # Kept articles carry _pub_ts from dedup, so cached articles render their age
+        # without re-parsing pub_date
+        return {"ticker": ticker, "articles": articles[:config.NEWS_DISPLAY_COUNT]}
+
+    async def _pace(self):
+        """
+        Spread remaining quota over the reset window instead of hitting 429s.
 
-            return {"ticker": ticker, "articles": articles[:config.NEWS_DISPLAY_COUNT]}
+        Each caller reserves its start slot before sleeping (no await in between), so
+        concurrent calls are spaced _min_interval apart rather than all waking together.
+        """
+        now = time.monotonic()
+        start = max(now, self._last_call + self._min_interval)
+        self._last_call = start
+        wait = start - now
+        if wait > 0:
+            logger.info(f"NDH | Pacing | Waiting {wait:.1f}s to preserve quota")
+            await asyncio.sleep(wait)
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        await self._http.aclose()
 
     def _update_quota_from_headers(self, headers: dict):
-        """Extract rate limit info from response headers."""
-        self.quota_limit = int(headers.get("X-RateLimit-Limit", 100))
-        self.quota_remaining = int(headers.get("X-RateLimit-Remaining", 0))
-        self.quota_reset = headers.get("X-RateLimit-Reset")
+        """
+        Extract rate limit info from response headers.
+        A missing limit/remaining header keeps the last known value (100/0 before any).
+        """
+        g = headers.get
+        limit = g("X-RateLimit-Limit")
+        remaining = g("X-RateLimit-Remaining")
+        reset = g("X-RateLimit-Reset")
+
+        # Work on locals and store each attribute once
+        limit = int(limit) if limit is not None else (self.quota_limit if self.quota_limit is not None else 100)
+        remaining = int(remaining) if remaining is not None else (self.quota_remaining or 0)
+        self.quota_limit = limit
+        self.quota_remaining = remaining
+        self.quota_reset = reset
 
-        if self.quota_remaining < 20:
+        if remaining < 20:
             logger.warning(
-                f"NDH | Quota low: {self.quota_limit - self.quota_remaining}/{self.quota_limit} used | "
-                f"Resets: {self.quota_reset}"
+                f"NDH | Quota low: {limit - remaining}/{limit} used | "
+                f"Resets: {reset}"
             )
 
+            reset_seconds = self._parse_reset_seconds(reset)
+            if reset_seconds is None:
+                min_interval = 1.0
+            else:
+                min_interval = max(1.0, reset_seconds / max(remaining, 1))
+            self._min_interval = min(min_interval, config.RATE_LIMIT_MAX_WAIT_SECONDS)
+        else:
+            self._min_interval = 0.0
+
+    def _parse_reset_seconds(self, reset: Optional[str]) -> Optional[float]:
+        """Seconds until quota reset from X-RateLimit-Reset (epoch, delta seconds, or ISO 8601)."""
+        if not reset:
+            return None
+
+        try:
+            value = float(reset)
+            # Large values are epoch timestamps, small ones are seconds from now
+            return max(0.0, value - time.time()) if value > 1e9 else max(0.0, value)
+        except ValueError:
+            pass
+
+        try:
+            reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+    @staticmethod
+    def _norm_title(title: str) -> int:
+        """
+        Dedup key for a headline: NFKC-normalized, casefolded, punctuation stripped and
+        whitespace runs collapsed to single spaces, then hashed to a stable 64-bit int.
+        """
+        normalized = unicodedata.normalize("NFKC", title).casefold().translate(_punct_table())
+        return _hash64(" ".join(normalized.split()).encode())
+
+    @staticmethod
+    def _norm_url(url: str) -> Optional[int]:
+        """
+        Dedup key for an article link: host lowercased without "www.", scheme, fragment,
+        trailing slash and utm_* tracking params dropped, remaining params sorted, then
+        hashed to a stable 64-bit int like headlines. None if no usable URL.
+        """
+        parts = urlsplit(url.strip())
+        if not parts.netloc:
+            return None
+
+        host = parts.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+        query = urlencode(sorted(
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_")
+        ))
+        return _hash64(f"{host}{parts.path.rstrip('/')}?{query}".encode())
+
     def _deduplicate_articles(self, articles: list, search_term: str = "") -> list:
         """
-        Deduplicate articles:
+        Deduplicate articles without sorting the whole list:
         1. Filter for relevance (search term must be in title)
-        2. Remove duplicate headlines (keep first/freshest)
-        3. Keep up to 2 articles per source (freshest ones)
+        2. Remove duplicate URLs, ignoring tracking params and host case (keep freshest)
+        3. Remove duplicate headlines, ignoring case and punctuation (keep freshest)
+        4. Keep up to 2 articles per source (freshest ones), in two slots per source
+
+        Only the few survivors are sorted, to return them freshest first.
         """
-        # Step 1: Filter for relevance - search term must appear in title
-        relevant_articles = []
-        for article in articles:
+        # Handle OR queries like "Google OR Alphabet" - split once, not per article
+        search_terms = tuple(term.strip().lower() for term in search_term.split(" OR "))
+
+        # Nothing to deduplicate in 0 or 1 articles - only relevance and the parsed
+        # publish time the UI reads still apply
+        if len(articles) < 2:
+            kept = [a for a in articles if any(term in a.get("title", "").lower() for term in search_terms)]
+            for article in kept:
+                if "_pub_ts" not in article:
+                    article["_pub_ts"] = _parse_pub_ts(article.get("pub_date", ""))
+            return kept
+
+        # Relevant articles as (freshness key, article), with duplicate URLs collapsed to the
+        # freshest copy - republished articles often share a link under different titles
+        candidates = []
+        best_by_url = {}
+        relevant = 0
+        for index, article in enumerate(articles):
             title = article.get("title", "").lower()
 
-            # Check if any part of the search term appears in title
-            # Handle OR queries like "Google OR Alphabet"
-            search_terms = [term.strip().lower() for term in search_term.split(" OR ")]
-
-            if any(term in title for term in search_terms):
-                relevant_articles.append(article)
-
-        logger.debug(f"NDH | Relevance filter: {len(articles)} → {len(relevant_articles)} relevant")
-
-        # Step 2: Remove duplicate headlines
-        seen_headlines = set()
-        unique_headlines = []
-        for article in relevant_articles:
-            headline = article.get("title", "").lower().strip()
-            if headline not in seen_headlines:
-                seen_headlines.add(headline)
-                unique_headlines.append(article)
-
-        # Step 2: Keep up to 2 articles per source (freshest ones)
-        source_articles = {}
-        for article in unique_headlines:
-            source = article.get("source_title", "unknown")
-            if source not in source_articles:
-                source_articles[source] = []
-            source_articles[source].append(article)
-
-        # For each source, keep up to 2 freshest articles
-        result = []
-        for source, source_list in source_articles.items():
-            # Sort by date descending and take top 2
-            sorted_articles = sorted(source_list, key=lambda x: x.get("pub_date", ""), reverse=True)
-            result.extend(sorted_articles[:2])
-
-        # Sort final result by date descending (freshest first)
-        result = sorted(result, key=lambda x: x.get("pub_date", ""), reverse=True)
+            # Relevance - search term must appear in title
+            if not any(term in title for term in search_terms):
+                continue
+            relevant += 1
+
+            # Parse pub_date once into epoch seconds, stored on the article as _pub_ts so
+            # every comparison below is a float compare (and the UI reuses it)
+            if "_pub_ts" not in article:
+                article["_pub_ts"] = _parse_pub_ts(article.get("pub_date", ""))
+            pub_ts = article["_pub_ts"]
+
+            # Freshness key: newer pub_date wins (unknown dates count as oldest); on a tie
+            # the earlier article in the input does (what a stable newest-first sort would
+            # keep). Keys are unique, so sorted entries never fall back to comparing dicts
+            entry = ((pub_ts if pub_ts is not None else -math.inf, -index), article)
+
+            url_key = self._norm_url(article.get("article_link") or article.get("url") or "")
+            if url_key is None:
+                candidates.append(entry)
+                continue
+            current = best_by_url.get(url_key)
+            if current is None or entry[0] > current[0]:
+                best_by_url[url_key] = entry
+        candidates.extend(best_by_url.values())
+
+        # Freshest article per duplicate headline - keyed on the hash of the normalized
+        # title, so near-duplicates differing in case, punctuation or Unicode form collapse
+        best_by_headline = {}
+        for entry in candidates:
+            headline_key = self._norm_title(entry[1].get("title", ""))
+            current = best_by_headline.get(headline_key)
+            if current is None or entry[0] > current[0]:
+                best_by_headline[headline_key] = entry
+
+        # Up to 2 articles per source: two slots per source, kept freshest first, so
+        # each article costs at most two comparisons
+        per_source = {}
+        for entry in best_by_headline.values():
+            source = entry[1].get("source_title", "unknown")
+            slots = per_source.get(source)
+            if slots is None:
+                per_source[source] = [entry]
+            elif len(slots) < 2:
+                if entry[0] > slots[0][0]:
+                    slots.insert(0, entry)
+                else:
+                    slots.append(entry)
+            elif entry[0] > slots[1][0]:
+                if entry[0] > slots[0][0]:
+                    slots[1] = slots[0]
+                    slots[0] = entry
+                else:
+                    slots[1] = entry
+
+        kept = [entry for slots in per_source.values() for entry in slots]
+        kept.sort(key=itemgetter(0), reverse=True)
+        result = [article for _, article in kept]
 
         logger.debug(
             f"NDH | Dedup details: {len(articles)} → "
-            f"{len(unique_headlines)} after headline dedup → "
+            f"{relevant} relevant → "
+            f"{len(candidates)} after URL dedup → "
+            f"{len(best_by_headline)} after headline dedup → "
             f"{len(result)} after source dedup (up to 2 per source)"
         )
 
@@ -1,61 +1,169 @@
 from openai import AsyncOpenAI
 from openai import APIError
-from datetime import datetime
+import time
+import hashlib
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Optional
 from app.config import config
 from app.utils.logger import logger
 from app.utils.retry import retry_with_backoff
 
 class OpenAIClient:
+    INSIGHT_CACHE_SIZE = 64  # max prompts remembered in-process
+
+    SYSTEM_PROMPT = (
+        "You are a financial analyst assistant. Provide concise, "
+        "insightful analysis based on the provided stock data and news. "
+        "Focus on key trends, notable news impact, and relevant factors to watch. "
+        "Keep response under 100 words. Do not provide financial advice."
+    )
+
     def __init__(self):
         self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
         self.session_calls = 0
         self.session_tokens = 0
+        # LRU of prompt digest -> (expires_at, insight); identical inputs within
+        # CACHE_TTL_MINUTES skip the API round-trip, after that Generate asks again
+        self._insight_cache: OrderedDict[bytes, tuple] = OrderedDict()
 
     @retry_with_backoff(retry_on=(APIError,))
     async def generate_insights(self, ticker: str, price_data: dict, news_data: dict) -> dict:
         """Generate AI insights based on price and news data."""
         prompt = self._build_prompt(ticker, price_data, news_data)
 
-        start_time = datetime.now()
+        cache_key = self._prompt_key(prompt)
+        cached = self._get_cached_insight(ticker, cache_key)
+        if cached is not None:
+            return cached
+
+        start_time = time.perf_counter()
         response = await self.client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a financial analyst assistant. Provide concise, "
-                        "insightful analysis based on the provided stock data and news. "
-                        "Focus on key trends, notable news impact, and relevant factors to watch. "
-                        "Keep response under 100 words. Do not provide financial advice."
-                    )
-                },
-                {"role": "user", "content": prompt}
-            ],
+            messages=self._build_messages(prompt),
             max_tokens=210,
             temperature=0.7,
         )
-        elapsed = (datetime.now() - start_time).total_seconds() * 1000
+        elapsed = (time.perf_counter() - start_time) * 1000
 
-        # Track usage
-        usage = response.usage
-        self.session_calls += 1
-        self.session_tokens += usage.total_tokens
+        return self._record_insight(
+            ticker, cache_key, response.choices[0].message.content, response.usage, elapsed
+        )
 
-        logger.info(
-            f"OPENAI | Call for {ticker} | "
-            f"Tokens: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion = {usage.total_tokens} total | "
-            f"Response time: {elapsed:.0f}ms"
+    async def generate_insights_stream(
+        self,
+        ticker: str,
+        price_data: dict,
+        news_data: dict,
+        on_complete: Optional[Callable[[dict], None]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate AI insights, yielding text chunks as the model produces them.
+
+        on_complete receives the same dict generate_insights() returns once the
+        stream finishes. Streams are not retried: a partial answer can't be replayed.
+        """
+        prompt = self._build_prompt(ticker, price_data, news_data)
+
+        cache_key = self._prompt_key(prompt)
+        cached = self._get_cached_insight(ticker, cache_key)
+        if cached is not None:
+            if on_complete:
+                on_complete(cached)
+            yield cached["insight"]
+            return
+
+        start_time = time.perf_counter()
+        stream = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=self._build_messages(prompt),
+            max_tokens=210,
+            temperature=0.7,
+            stream=True,
+            stream_options={"include_usage": True},
         )
+
+        parts = []
+        usage = None
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        elapsed = (time.perf_counter() - start_time) * 1000
+
+        # An empty stream isn't an insight: don't cache it or hand it to on_complete
+        if not parts:
+            logger.warning(f"OPENAI | Empty response for {ticker} | Response time: {elapsed:.0f}ms")
+            return
+
+        result = self._record_insight(ticker, cache_key, "".join(parts), usage, elapsed)
+        if on_complete:
+            on_complete(result)
+
+    def _build_messages(self, prompt: str) -> list:
+        """Build the chat messages for a prompt."""
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _prompt_key(self, prompt: str) -> bytes:
+        """Digest identifying a prompt in the in-process insight cache."""
+        return hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+
+    def _get_cached_insight(self, ticker: str, cache_key: bytes) -> Optional[dict]:
+        """Return an unexpired insight previously generated for an identical prompt, if any."""
+        entry = self._insight_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, cached = entry
+        if time.monotonic() >= expires_at:
+            del self._insight_cache[cache_key]
+            return None
+
+        self._insight_cache.move_to_end(cache_key)
+        logger.info(f"OPENAI | Prompt cache hit for {ticker} | Skipping API call")
+        return cached
+
+    def _record_insight(self, ticker: str, cache_key: bytes, insight: str, usage, elapsed: float) -> dict:
+        """Track usage, log the call, and remember the insight for identical prompts."""
+        total_tokens = usage.total_tokens if usage else 0
+        self.session_calls += 1
+        self.session_tokens += total_tokens
+
+        if usage:
+            logger.info(
+                f"OPENAI | Call for {ticker} | "
+                f"Tokens: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion = {usage.total_tokens} total | "
+                f"Response time: {elapsed:.0f}ms"
+            )
+        else:
+            logger.info(f"OPENAI | Call for {ticker} | Tokens: unknown | Response time: {elapsed:.0f}ms")
         logger.info(
             f"OPENAI | Session total: {self.session_calls} calls | ~{self.session_tokens} tokens used"
         )
 
-        return {
+        result = {
             "ticker": ticker,
-            "insight": response.choices[0].message.content,
-            "tokens_used": usage.total_tokens,
+            "insight": insight,
+            "tokens_used": total_tokens,
         }
 
+        self._insight_cache[cache_key] = (time.monotonic() + config.CACHE_TTL_MINUTES * 60, result)
+        self._insight_cache.move_to_end(cache_key)
+        if len(self._insight_cache) > self.INSIGHT_CACHE_SIZE:
+            self._insight_cache.popitem(last=False)
+
+        return result
+
+    async def aclose(self):
+        """Close the underlying OpenAI HTTP client."""
+        await self.client.close()
+
     def _build_prompt(self, ticker: str, price_data: dict, news_data: dict) -> str:
         """Build prompt with price and news context."""
         # Price summary
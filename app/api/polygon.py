@@ -1,15 +1,33 @@
 import httpx
 import asyncio
+import math
+import time
+import orjson
 from datetime import datetime, timedelta
 from app.config import config
 from app.utils.logger import logger
 from app.utils.retry import retry_with_backoff
+from app.utils.http import PayloadMemo, RateLimiter, SharedAsyncClient
+
+# Every related ticker on the dashboard, so one grouped download per date serves all pages
+_RELATED_UNIVERSE = frozenset(t for related in config.RELATED_STOCKS.values() for t in related)
 
 class PolygonClient:
     BASE_URL = "https://api.polygon.io"
+    RELATED_LOOKBACK_DAYS = 7  # calendar days searched for the last two trading sessions
 
     def __init__(self):
         self.api_key = config.POLYGON_API_KEY
+        # HTTP/2 multiplexes the parallel related-stocks requests onto one connection
+        self._http = SharedAsyncClient(http2=True)
+        # Every Polygon request (retries included) goes through the per-minute quota
+        self._rate_limit = RateLimiter(config.POLYGON_CALLS_PER_MINUTE, 60.0, name="POLYGON")
+        # Transformed stock data per ticker, reused while Polygon returns the same bars
+        self._transformed = PayloadMemo()
+        # Grouped closes per settled trading day ("%Y-%m-%d" -> (tickers, closes)), so each
+        # ticker page and refresh doesn't re-download the ~1MB whole-market payload
+        self._closes_by_date: dict = {}
+        self._closes_inflight: dict = {}
 
     @retry_with_backoff(retry_on=(httpx.HTTPError,))
     async def get_stock_data(self, ticker: str) -> dict:
@@ -20,63 +38,82 @@ class PolygonClient:
         url = f"{self.BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day/{start_date:%Y-%m-%d}/{end_date:%Y-%m-%d}"
         params = {"apiKey": self.api_key, "adjusted": "true", "sort": "asc"}
 
-        async with httpx.AsyncClient(timeout=config.REQUEST_TIMEOUT) as client:
-            start_time = datetime.now()
+        await self._rate_limit.acquire()
+        start_time = time.perf_counter()
+
+        response = await self._http.get().get(url, params=params)
+        response.raise_for_status()
 
-            response = await client.get(url, params=params)
-            response.raise_for_status()
+        elapsed = (time.perf_counter() - start_time) * 1000
 
-            elapsed = (datetime.now() - start_time).total_seconds() * 1000
-            data = response.json()
+        data = orjson.loads(response.content)
+        results = data.get("results", [])
 
+        # Each response carries its own request_id, so the raw bytes never repeat; the bar
+        # count plus first and last bar identify the window (a new or revised latest bar,
+        # or the window sliding forward, all change one of them)
+        fingerprint = (len(results), results[0], results[-1]) if results else (0,)
+        cached = self._transformed.get(ticker, fingerprint)
+        if cached is not None:
             logger.info(
                 f"POLYGON | Ticker: {ticker} | Response time: {elapsed:.0f}ms | "
-                f"Data points: {len(data.get('results', []))}"
+                f"Bars unchanged, reusing transformed data"
             )
+            return cached
 
-            return self._transform_response(data, ticker)
+        logger.info(
+            f"POLYGON | Ticker: {ticker} | Response time: {elapsed:.0f}ms | "
+            f"Data points: {len(results)}"
+        )
+
+        return self._transformed.put(ticker, fingerprint, self._transform_response(data, ticker))
 
     async def get_related_stocks(self, tickers: list) -> dict:
-        """Fetch current data for related stocks in parallel."""
-        @retry_with_backoff(retry_on=(httpx.HTTPError,))
-        async def fetch_ticker(ticker: str):
-            try:
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=5)
-
-                url = f"{self.BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day/{start_date:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-                params = {"apiKey": self.api_key, "adjusted": "true", "sort": "desc"}
-
-                async with httpx.AsyncClient(timeout=config.REQUEST_TIMEOUT) as client:
-                    response = await client.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-
-                    res = data.get("results", [])
-                    if len(res) >= 2:
-                        current = res[0]["c"]
-                        previous = res[1]["c"]
-                        change = current - previous
-                        change_pct = (change / previous) * 100
-
-                        return ticker, {
-                            "current": current,
-                            "change": change,
-                            "change_pct": change_pct
-                        }
-                    else:
-                        logger.warning(f"POLYGON | Insufficient data for {ticker} | Got {len(res)} data points, need 2")
-                        return ticker, None
-            except Exception as e:
-                logger.warning(f"POLYGON | Failed to fetch {ticker} | {e}")
-                return ticker, None
-
-        # Fetch all tickers in parallel
-        tasks = [fetch_ticker(ticker) for ticker in tickers]
-        results_list = await asyncio.gather(*tasks)
-
-        # Filter out failed fetches
-        results = {ticker: data for ticker, data in results_list if data is not None}
+        """
+        Fetch current price and daily change for related stocks.
+
+        Uses Polygon's grouped daily bars (every US ticker for one day in a single call),
+        so the common case is two requests no matter how many related tickers there are.
+        """
+        if not tickers:
+            return {}
+
+        wanted = set(tickers)
+
+        # Most recent first. Usually the first two weekdays have bars; walk further back
+        # only for market holidays or when today's bars aren't published yet
+        candidate_dates = self._recent_weekdays(self.RELATED_LOOKBACK_DAYS)
+        daily_closes = []
+        while candidate_dates and len(daily_closes) < 2:
+            needed = 2 - len(daily_closes)
+            batch, candidate_dates = candidate_dates[:needed], candidate_dates[needed:]
+
+            batch_results = await asyncio.gather(
+                *(self._closes_for(date, wanted) for date in batch),
+                return_exceptions=True,
+            )
+            for date, closes in zip(batch, batch_results):
+                if isinstance(closes, Exception):
+                    logger.warning(f"POLYGON | Failed to fetch grouped bars for {date:%Y-%m-%d} | {closes}")
+                elif closes:
+                    daily_closes.append(closes)
+
+        results = {}
+        for ticker in tickers:
+            closes = [day[ticker] for day in daily_closes if ticker in day]
+            if len(closes) >= 2:
+                current = closes[0]
+                previous = closes[1]
+                change = current - previous
+                change_pct = (change / previous) * 100
+
+                results[ticker] = {
+                    "current": current,
+                    "change": change,
+                    "change_pct": change_pct
+                }
+            else:
+                logger.warning(f"POLYGON | Insufficient data for {ticker} | Got {len(closes)} data points, need 2")
 
         if len(results) == 0:
             logger.warning(f"POLYGON | Related stocks request failed | 0/{len(tickers)} successful")
@@ -86,18 +123,104 @@ class PolygonClient:
             logger.info(f"POLYGON | Related stocks fetched | {len(results)}/{len(tickers)} successful")
         return results
 
+    async def _closes_for(self, date: datetime, wanted: set) -> dict:
+        """
+        Closing prices on `date` for at least the `wanted` tickers.
+
+        Memoized per date for every related ticker combined, and concurrent callers for
+        the same date share one download.
+        """
+        key = f"{date:%Y-%m-%d}"
+        cached = self._closes_by_date.get(key)
+        if cached is not None and wanted <= cached[0]:
+            return cached[1]
+
+        inflight = self._closes_inflight.get(key)
+        if inflight is None or not wanted <= inflight[0]:
+            tickers = _RELATED_UNIVERSE | wanted
+            inflight = (tickers, asyncio.create_task(self._load_closes(date, key, tickers)))
+            self._closes_inflight[key] = inflight
+
+            def _forget(_, entry=inflight):
+                if self._closes_inflight.get(key) is entry:
+                    del self._closes_inflight[key]
+
+            inflight[1].add_done_callback(_forget)
+        # Shielded so one caller going away doesn't cancel the download for the others
+        return await asyncio.shield(inflight[1])
+
+    async def _load_closes(self, date: datetime, key: str, tickers: frozenset) -> dict:
+        """Download one day's closes and memoize them once the day has settled."""
+        closes = await self._grouped_closes(date, tickers)
+        # Today's bars may be missing or still changing, so only earlier days are kept
+        if closes and date.date() < datetime.now().date():
+            self._closes_by_date[key] = (tickers, closes)
+            while len(self._closes_by_date) > self.RELATED_LOOKBACK_DAYS:
+                del self._closes_by_date[min(self._closes_by_date)]
+        return closes
+
+    @retry_with_backoff(retry_on=(httpx.HTTPError,))
+    async def _grouped_closes(self, date: datetime, tickers: set) -> dict:
+        """Fetch closing prices for the given tickers from one day's grouped daily bars."""
+        url = f"{self.BASE_URL}/v2/aggs/grouped/locale/us/market/stocks/{date:%Y-%m-%d}"
+        params = {"apiKey": self.api_key, "adjusted": "true"}
+
+        await self._rate_limit.acquire()
+        response = await self._http.get().get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        # Grouped results carry the ticker symbol in "T" (lowercase "t" is the timestamp)
+        return {r["T"]: r["c"] for r in data.get("results", []) if r.get("T") in tickers}
+
+    def _recent_weekdays(self, days: int) -> list:
+        """List weekdays within the last `days` calendar days, most recent first."""
+        today = datetime.now()
+        dates = (today - timedelta(days=offset) for offset in range(days))
+        return [date for date in dates if date.weekday() < 5]
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        await self._http.aclose()
+
     def _transform_response(self, data: dict, ticker: str) -> dict:
-        """Transform API response to internal format."""
+        """
+        Transform API response to internal format.
+        "prices" is columnar: {"date": [...], "open": [...], ..., "volume": [...]}.
+        """
         results = data.get("results", [])
 
+        # Build the price columns and track the close range in a single pass.
+        # Columnar prices: one flat list per field rather than a dict per bar
+        dates, opens, highs, lows, closes, volumes = [], [], [], [], [], []
+        min_price = math.inf
+        max_price = -math.inf
+        for r in results:
+            close = r["c"]
+            if close < min_price:
+                min_price = close
+            if close > max_price:
+                max_price = close
+            dates.append(datetime.fromtimestamp(r["t"] / 1000).isoformat())
+            opens.append(r["o"])
+            highs.append(r["h"])
+            lows.append(r["l"])
+            closes.append(close)
+            volumes.append(r["v"])
+
+        prices = {
+            "date": dates,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+            "volume": volumes,
+        }
+
         # Calculate price range for chart y-axis with buffer
         price_range_min = None
         price_range_max = None
         if results:
-            all_prices = [r["c"] for r in results]
-            min_price = min(all_prices)
-            max_price = max(all_prices)
-
             # Add buffer to min/max for better chart visualization
             price_range = max_price - min_price
             buffer = price_range * config.PRICE_CHART_BUFFER_PCT if price_range > 0 else max_price * config.PRICE_CHART_BUFFER_PCT
@@ -106,19 +229,9 @@ class PolygonClient:
 
         return {
             "ticker": ticker,
-            "prices": [
-                {
-                    "date": datetime.fromtimestamp(r["t"] / 1000).isoformat(),
-                    "open": r["o"],
-                    "high": r["h"],
-                    "low": r["l"],
-                    "close": r["c"],
-                    "volume": r["v"],
-                }
-                for r in results
-            ],
-            "current_price": results[-1]["c"] if results else None,
-            "previous_close": results[-2]["c"] if len(results) > 1 else None,
+            "prices": prices,
+            "current_price": closes[-1] if closes else None,
+            "previous_close": closes[-2] if len(closes) > 1 else None,
             "price_range_min": price_range_min,
             "price_range_max": price_range_max,
         }
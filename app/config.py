@@ -1,6 +1,10 @@
 import os
+from collections import namedtuple
 from pathlib import Path
 
+# Display metadata for a ticker; name_exchange is the preformatted "Name · Exchange" caption
+TickerMeta = namedtuple("TickerMeta", ["name", "exchange", "brand_color", "name_exchange"])
+
 class Config:
     # Deployment
     DEPLOYMENT_MODE: str = os.getenv("DEPLOYMENT_MODE", "local")
@@ -8,8 +12,13 @@ class Config:
 
     # Cache - with validation
     CACHE_TTL_MINUTES: int = max(1, int(os.getenv("CACHE_TTL_MINUTES", "10")))
+    CACHE_SWR_MINUTES: int = max(0, int(os.getenv("CACHE_SWR_MINUTES", "30")))
     CACHE_MAX_AGE_HOURS: int = max(1, int(os.getenv("CACHE_MAX_AGE_HOURS", "24")))
     CACHE_DIR: Path = Path(__file__).parent.parent / "cache"
+    CACHE_COMPRESSION: bool = os.getenv("CACHE_COMPRESSION", "false").lower() == "true"
+    CACHE_MEMO_TTL_SECONDS: int = 30  # in-process memo in front of the file cache
+    CACHE_MEMO_MAX_ENTRIES: int = 64
+    CACHE_CLEANUP_INTERVAL_SECONDS: int = 3600  # run stale-file cleanup at most once per hour
 
     # Background refresh - with validation
     REFRESH_INTERVAL_HOURS: int = max(1, int(os.getenv("REFRESH_INTERVAL_HOURS", "3")))
@@ -40,6 +49,19 @@ class Config:
         "F": {"name": "Ford", "exchange": "NYSE"},
     }
 
+    # Precomputed lookups derived from TICKER_INFO
+    SEARCH_TERMS: dict = {t: info.get("search_term", t) for t, info in TICKER_INFO.items()}
+    TICKER_LABELS: dict = {t: f"{t} — {info['name']}" for t, info in TICKER_INFO.items() if "name" in info}
+    TICKER_META: dict = {
+        t: TickerMeta(
+            info["name"],
+            info["exchange"],
+            info.get("brand_color", "#22c55e"),
+            f"{info['name']} · {info['exchange']}",
+        )
+        for t, info in TICKER_INFO.items()
+    }
+
     # Related stocks for each ticker
     RELATED_STOCKS: dict = {
         "NFLX": ["DIS", "PARA", "WBD"],
@@ -51,14 +73,23 @@ class Config:
     REQUEST_TIMEOUT: int = max(1, int(os.getenv("REQUEST_TIMEOUT", "10")))
     MAX_RETRIES: int = max(0, int(os.getenv("MAX_RETRIES", "3")))
     RETRY_BACKOFF_BASE: float = max(0.1, float(os.getenv("RETRY_BACKOFF_BASE", "0.5")))
+    # Polygon's free tier allows 5 calls/minute; 0 disables client-side limiting (paid plans)
+    POLYGON_CALLS_PER_MINUTE: int = max(0, int(os.getenv("POLYGON_CALLS_PER_MINUTE", "5")))
+    RETRY_CAP_SECONDS: float = 60.0  # upper bound on any single retry delay
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 10.0  # cap on proactive pacing between quota-limited calls
+    HTTP_MAX_CONNECTIONS: int = 100  # per-client connection pool size
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # idle connections kept open for reuse
 
     # News - with validation
     NEWS_FETCH_COUNT: int = max(1, int(os.getenv("NEWS_FETCH_COUNT", "100")))
     NEWS_DISPLAY_COUNT: int = max(1, int(os.getenv("NEWS_DISPLAY_COUNT", "5")))
 
     # UI Constants
-    STREAMING_CHAR_DELAY: float = 0.01  # seconds per character for AI insights streaming effect
+    INSIGHT_STREAM_RENDER_CHARS: int = 20  # redraw streamed AI insights every N new characters
     PRICE_CHART_BUFFER_PCT: float = 0.10  # 10% buffer above/below price range for chart
     LOG_FILE_MAX_BYTES: int = 1_000_000  # 1MB max log file size
 
 config = Config()
+
+# Derived values for hot paths (read once at import)
+CACHE_TTL_SECONDS: int = config.CACHE_TTL_MINUTES * 60
@@ -12,6 +12,13 @@ sys.path.insert(0, str(project_root))
 # Load environment variables
 load_dotenv()
 
+# Use uvloop's faster event loop when available (not supported on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 from app.config import config
 from app.services.data_service import data_service
 from app.ui.components import (
@@ -21,6 +28,8 @@ from app.ui.components import (
     render_insights_section,
     render_data_age_indicator,
     render_related_stocks,
+    run_async,
+    inject_styles,
 )
 from app.utils.logger import logger, log_startup
 
@@ -32,23 +41,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Reduce top padding and add horizontal padding
-st.markdown(
-    """
-    <style>
-    .block-container {
-        padding-top: 1rem !important;
-    }
-    @media (min-width: calc(736px + 8rem)) {
-        .block-container {
-            padding-left: 8rem !important;
-            padding-right: 8rem !important;
-        }
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+# Page styles (stylesheet is read once per process)
+inject_styles()
 
 # Initialize
 if "initialized" not in st.session_state:
@@ -82,24 +76,44 @@ with col_main:
         ticker = st.selectbox(
             "Select stock",
             options=config.TICKERS,
-            format_func=lambda t: f"{t} — {config.TICKER_INFO[t]['name']}",
+            format_func=config.TICKER_LABELS.get,
             label_visibility="collapsed"
         )
 
-# Render sections with individual loading states
+async def load_dashboard_data(ticker: str) -> list:
+    """Fetch stock, related stocks, and news concurrently on a single event loop."""
+    return await asyncio.gather(
+        data_service.get_stock_data(ticker),
+        data_service.get_related_stocks(ticker),
+        data_service.get_news(ticker),
+        return_exceptions=True,
+    )
+
+# Fetch all sections at once on the shared event loop so page load costs
+# the slowest API, not the sum of all three
+loading_placeholder = st.empty()
+with loading_placeholder:
+    with st.spinner("Loading market data..."):
+        try:
+            stock_data, related_data, news_data = run_async(load_dashboard_data(ticker))
+        except Exception as e:
+            logger.error(f"Failed to load dashboard data: {e}")
+            stock_data = related_data = news_data = None
+
+loading_placeholder.empty()
+
+if isinstance(stock_data, Exception):
+    logger.error(f"Failed to load stock data: {stock_data}")
+    stock_data = None
+if isinstance(related_data, Exception):
+    logger.error(f"Failed to load related stocks: {related_data}")
+    related_data = None
+if isinstance(news_data, Exception):
+    logger.error(f"Failed to load news: {news_data}")
+    news_data = None
+
+# Render sections
 with col_main:
-    # Stock data section with its own loading
-    stock_placeholder = st.empty()
-    with stock_placeholder:
-        with st.spinner("Loading stock data..."):
-            try:
-                stock_data = asyncio.run(data_service.get_stock_data(ticker))
-            except Exception as e:
-                logger.error(f"Failed to load stock data: {e}")
-                stock_data = None
-
-    stock_placeholder.empty()
-
     if stock_data:
         render_stock_info(ticker, stock_data)
         render_price_chart(stock_data)
@@ -109,18 +123,6 @@ with col_main:
     else:
         st.error("Unable to load stock data. Please try again later.")
 
-    # Related stocks section with its own loading
-    related_placeholder = st.empty()
-    with related_placeholder:
-        with st.spinner("Loading related stocks..."):
-            try:
-                related_data = asyncio.run(data_service.get_related_stocks(ticker))
-            except Exception as e:
-                logger.error(f"Failed to load related stocks: {e}")
-                related_data = None
-
-    related_placeholder.empty()
-
     if related_data:
         render_related_stocks(related_data)
     elif config.RELATED_STOCKS.get(ticker):
@@ -128,21 +130,9 @@ with col_main:
         st.info(f"Related stocks data unavailable for {ticker}")
 
 with col_sidebar:
-    # News section with its own loading
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("### :green[Latest News]")
 
-    news_placeholder = st.empty()
-    with news_placeholder:
-        with st.spinner("Loading news..."):
-            try:
-                news_data = asyncio.run(data_service.get_news(ticker))
-            except Exception as e:
-                logger.error(f"Failed to load news: {e}")
-                news_data = None
-
-    news_placeholder.empty()
-
     if news_data:
         render_news_section(news_data)
         if news_data.get("is_fallback"):
@@ -1,10 +1,24 @@
-import json
+import gzip
+import os
+import tempfile
+import time
+import zlib
+import orjson
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, Any
-from app.config import config
+from app.config import config, CACHE_TTL_SECONDS
 from app.utils.logger import logger
 
+# Errors raised when a cache file is truncated or not valid (gzipped) JSON
+_CORRUPT_ERRORS = (orjson.JSONDecodeError, KeyError, gzip.BadGzipFile, EOFError, zlib.error)
+
+# Mode for new cache files: what open() would give under the process umask (0644 by
+# default). os.umask can only be read by setting it, so it is restored straight away
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
 class CacheService:
     """
     Cache service for managing JSON-based file caching with TTL (Time To Live) support.
@@ -15,25 +29,53 @@ class CacheService:
 
     Key features:
     - JSON file-based storage for easy inspection and debugging
+    - Optional gzip compression (CACHE_COMPRESSION) for smaller, faster-to-read files
     - Automatic cleanup of files older than CACHE_MAX_AGE_HOURS (default: 24 hours)
     - Human-readable age formatting (e.g., "5m ago", "2h ago")
     - Timestamp tracking for all cached data
 
     Usage:
         cache_service.set("polygon", "NFLX", data)
+        cache_service.set_many({("polygon", "NFLX"): data, ("news", "NFLX"): news})
         fresh_data = cache_service.get_fresh("polygon", "NFLX")  # None if stale
         fallback_data = cache_service.get_stale("polygon", "NFLX")  # Returns even if stale
 
-    Cache file naming: {cache_type}_{ticker}.json
+    Cache file naming: {cache_type}_{ticker}.json ({cache_type}_{ticker}.json.gz when compressed)
     Example: polygon_NFLX.json, news_GOOGL.json, insights_TSLA.json
     """
     def __init__(self):
         self.cache_dir = config.CACHE_DIR
         self.cache_dir.mkdir(exist_ok=True)
+        self._last_cleanup: float = 0.0
+
+    def _load_json(self, path: Path) -> dict:
+        """Read and parse a cache file."""
+        if path.suffix == ".gz":
+            with gzip.open(path, "rb") as f:
+                return orjson.loads(f.read())
+
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    def _encode_json(self, path: Path, data: dict) -> bytes:
+        """Serialize a cache entry in the format its file suffix calls for."""
+        if path.suffix == ".gz":
+            # Level 1 keeps compression cheap; JSON still shrinks several-fold
+            return gzip.compress(orjson.dumps(data), compresslevel=1)
+
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
 
     def _get_cache_path(self, cache_type: str, ticker: str) -> Path:
         """Get path for a cache file."""
-        return self.cache_dir / f"{cache_type}_{ticker}.json"
+        suffix = ".json.gz" if config.CACHE_COMPRESSION else ".json"
+        return self.cache_dir / f"{cache_type}_{ticker}{suffix}"
+
+    def _get_file_age_seconds(self, cache_path: Path) -> Optional[float]:
+        """Get seconds since the cache file was last written, or None if it doesn't exist."""
+        try:
+            return time.time() - cache_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
 
     def get_fresh(self, cache_type: str, ticker: str) -> Optional[dict]:
         """
@@ -42,32 +84,40 @@ class CacheService:
         """
         cache_path = self._get_cache_path(cache_type, ticker)
 
-        if not cache_path.exists():
+        file_age_seconds = self._get_file_age_seconds(cache_path)
+        if file_age_seconds is None:
             logger.debug(f"CACHE | Miss (not found) | {cache_type}_{ticker}")
             return None
 
+        # The file is written after its timestamp, so an mtime past the TTL
+        # means the entry is stale - skip opening and parsing it
+        if file_age_seconds > CACHE_TTL_SECONDS:
+            logger.debug(
+                f"CACHE | Miss (stale) | {cache_type}_{ticker} | "
+                f"Age: {file_age_seconds / 60:.1f}m > TTL: {config.CACHE_TTL_MINUTES}m"
+            )
+            return None
+
         try:
-            with open(cache_path, "r") as f:
-                cached = json.load(f)
+            cached = self._load_json(cache_path)
 
             timestamp = datetime.fromisoformat(cached["timestamp"])
-            age = datetime.now() - timestamp
-            age_minutes = age.total_seconds() / 60
+            age_seconds = (datetime.now() - timestamp).total_seconds()
 
-            if age_minutes <= config.CACHE_TTL_MINUTES:
+            if age_seconds <= CACHE_TTL_SECONDS:
                 logger.debug(
                     f"CACHE | Hit | {cache_type}_{ticker} | "
-                    f"Age: {age_minutes:.1f}m"
+                    f"Age: {age_seconds / 60:.1f}m"
                 )
                 return cached
             else:
                 logger.debug(
                     f"CACHE | Miss (stale) | {cache_type}_{ticker} | "
-                    f"Age: {age_minutes:.1f}m > TTL: {config.CACHE_TTL_MINUTES}m"
+                    f"Age: {age_seconds / 60:.1f}m > TTL: {config.CACHE_TTL_MINUTES}m"
                 )
                 return None
 
-        except (json.JSONDecodeError, KeyError) as e:
+        except _CORRUPT_ERRORS as e:
             logger.warning(f"CACHE | Corrupted file | {cache_type}_{ticker} | {e}")
             return None
 
@@ -82,8 +132,7 @@ class CacheService:
             return None
 
         try:
-            with open(cache_path, "r") as f:
-                cached = json.load(f)
+            cached = self._load_json(cache_path)
 
             age = datetime.now() - datetime.fromisoformat(cached["timestamp"])
             logger.info(
@@ -93,44 +142,73 @@ class CacheService:
             cached["source"] = "fallback"
             return cached
 
-        except (json.JSONDecodeError, KeyError):
+        except _CORRUPT_ERRORS:
             return None
 
     def set(self, cache_type: str, ticker: str, data: Any) -> None:
         """Save data to cache."""
-        cache_path = self._get_cache_path(cache_type, ticker)
+        self.set_many({(cache_type, ticker): data})
 
-        cached = {
-            "data": data,
-            "timestamp": datetime.now().isoformat(),
-            "source": "api",
-        }
-
-        with open(cache_path, "w") as f:
-            json.dump(cached, f, indent=2)
-
-        logger.debug(f"CACHE | Write | {cache_type}_{ticker}")
+    def set_many(self, updates: dict) -> None:
+        """
+        Save several entries, keyed by (cache_type, ticker), in one batch.
+        Each file is written to a temp file then renamed into place, so readers
+        never see a partially written entry. Every entry still costs its own
+        create/write/rename; batching renames them together once all have been
+        serialized and runs the cleanup check once.
+        """
+        if not updates:
+            return
 
-        # Cleanup old files on write
-        self._cleanup()
+        timestamp = datetime.now().isoformat()
+        staged = []
+        try:
+            for (cache_type, ticker), data in updates.items():
+                cache_path = self._get_cache_path(cache_type, ticker)
+                # A unique temp file per write, so concurrent writers of the same entry
+                # never share one. Written through mkstemp's descriptor rather than
+                # reopened by name
+                fd, tmp_name = tempfile.mkstemp(
+                    dir=self.cache_dir, prefix=f".{cache_path.name}.", suffix=cache_path.suffix
+                )
+                tmp_path = Path(tmp_name)
+                staged.append((tmp_path, cache_path, f"{cache_type}_{ticker}"))
+
+                with os.fdopen(fd, "wb") as f:
+                    # mkstemp creates files 0600 and os.replace keeps the mode; restore
+                    # the umask default so a cron writer and the app can run as different users
+                    os.chmod(tmp_name, _FILE_MODE)
+                    f.write(self._encode_json(cache_path, {
+                        "data": data,
+                        "timestamp": timestamp,
+                        "source": "api",
+                    }))
+
+            for tmp_path, cache_path, name in staged:
+                os.replace(tmp_path, cache_path)
+                logger.debug(f"CACHE | Write | {name}")
+
+        finally:
+            # Don't leave temp files behind if a write failed part-way
+            for tmp_path, _, _ in staged:
+                tmp_path.unlink(missing_ok=True)
+
+        # Cleanup old files on write, at most once per cleanup interval
+        if time.time() - self._last_cleanup > config.CACHE_CLEANUP_INTERVAL_SECONDS:
+            self._cleanup()
+
+    def get_age_seconds(self, cache_type: str, ticker: str) -> Optional[float]:
+        """Get age of cached data in seconds (from the cache file's mtime), or None if missing."""
+        return self._get_file_age_seconds(self._get_cache_path(cache_type, ticker))
 
     def get_age(self, cache_type: str, ticker: str) -> Optional[str]:
-        """Get human-readable age of cached data."""
-        cache_path = self._get_cache_path(cache_type, ticker)
+        """Get human-readable age of cached data (from the cache file's mtime)."""
+        file_age_seconds = self._get_file_age_seconds(self._get_cache_path(cache_type, ticker))
 
-        if not cache_path.exists():
+        if file_age_seconds is None:
             return None
 
-        try:
-            with open(cache_path, "r") as f:
-                cached = json.load(f)
-
-            timestamp = datetime.fromisoformat(cached["timestamp"])
-            age = datetime.now() - timestamp
-            return self._format_age(age)
-
-        except (json.JSONDecodeError, KeyError):
-            return None
+        return self._format_age(timedelta(seconds=file_age_seconds))
 
     def _format_age(self, age: timedelta) -> str:
         """Format timedelta as human-readable string."""
@@ -149,24 +227,20 @@ class CacheService:
             return f"{days}d ago"
 
     def _cleanup(self) -> None:
-        """Delete cache files older than CACHE_MAX_AGE_HOURS."""
-        cutoff = datetime.now() - timedelta(hours=config.CACHE_MAX_AGE_HOURS)
+        """Delete cache files older than CACHE_MAX_AGE_HOURS (based on file mtime)."""
+        self._last_cleanup = time.time()
+        cutoff = self._last_cleanup - config.CACHE_MAX_AGE_HOURS * 3600
         deleted = 0
 
-        for cache_file in self.cache_dir.glob("*.json"):
+        for cache_file in self.cache_dir.glob("*.json*"):
             try:
-                with open(cache_file, "r") as f:
-                    cached = json.load(f)
-
-                timestamp = datetime.fromisoformat(cached["timestamp"])
-                if timestamp < cutoff:
+                if cache_file.stat().st_mtime < cutoff:
                     cache_file.unlink()
                     deleted += 1
 
-            except (json.JSONDecodeError, KeyError, OSError):
-                # If we can't read it, delete it
-                cache_file.unlink()
-                deleted += 1
+            except OSError:
+                # File vanished or is inaccessible; nothing to clean up
+                continue
 
         if deleted > 0:
             logger.info(f"CACHE | Cleanup | Deleted {deleted} stale files")
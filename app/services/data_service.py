@@ -1,5 +1,7 @@
-from typing import Optional, Callable, Awaitable
+from typing import Optional, Callable, Awaitable, AsyncIterator
 import asyncio
+import time
+from collections import OrderedDict
 from app.config import config
 from app.services.cache import cache_service
 from app.api.polygon import PolygonClient
@@ -7,6 +9,13 @@ from app.api.newsdatahub import NewsDataHubClient
 from app.api.openai_client import OpenAIClient
 from app.utils.logger import logger
 
+def _tagged(data: dict, data_age: Optional[str], is_fallback: bool) -> dict:
+    """
+    Shallow copy of cached data with data_age/is_fallback added.
+    Only the top-level keys are copied; nested values (e.g. the article list) are shared.
+    """
+    return {**data, "data_age": data_age, "is_fallback": is_fallback}
+
 class DataService:
     """
     Data service that orchestrates all data fetching operations with caching and fallback.
@@ -28,21 +37,34 @@ class DataService:
     - All API clients have automatic retry logic via @retry_with_backoff decorator
 
     Flow:
-    1. Check for fresh cached data (within TTL)
+    1. Check the in-process memo, then the file cache, for fresh data (within TTL)
     2. If background mode: return stale cache or None
-    3. If local mode: fetch from API with retry logic
-    4. On API failure: fallback to stale cache
-    5. Cache successful responses for future requests
+    3. If recently expired (within CACHE_SWR_MINUTES past TTL): return it and refresh in background
+    4. If local mode: fetch from API with retry logic (one fetch per key at a time)
+    5. On API failure: fallback to stale cache
+    6. Cache successful responses for future requests
 
     Usage:
         stock_data = await data_service.get_stock_data("NFLX")
         news_data = await data_service.get_news("NFLX")
         insights = await data_service.get_insights("NFLX", force_refresh=True)
+        async for chunk in data_service.stream_insights("NFLX"): ...
     """
     def __init__(self):
         self.polygon = PolygonClient()
         self.news = NewsDataHubClient()
         self.openai = OpenAIClient()
+        # (cache_type, cache_key) pairs with a background refresh in flight
+        self._refreshing: set = set()
+        self._refresh_tasks: set = set()
+        # In-process LRU in front of the file cache: (cache_type, cache_key) -> (expires_at, result)
+        self._memo: OrderedDict = OrderedDict()
+        # (cache_type, cache_key) -> task for an API fetch in flight, shared by concurrent callers
+        self._inflight: dict = {}
+
+    async def aclose(self):
+        """Close pooled HTTP connections held by the API clients."""
+        await asyncio.gather(self.polygon.aclose(), self.news.aclose(), self.openai.aclose())
 
     async def _fetch_with_cache(
         self,
@@ -61,48 +83,132 @@ class DataService:
             fetch_fn: Async function to fetch fresh data from API
             error_prefix: Prefix for error logging (e.g., 'POLYGON', 'NDH')
         """
-        # Ensure this function always awaits something to remain a proper coroutine
-        await asyncio.sleep(0)
+        # Repeat requests within a few seconds skip the file read entirely
+        memo_key = (cache_type, cache_key)
+        memoized = self._memo_get(memo_key)
+        if memoized is not None:
+            return memoized
 
-        # Check cache first for fresh data
-        cached = cache_service.get_fresh(cache_type, cache_key)
+        # Check cache first for fresh data. File reads and JSON parsing run in a worker
+        # thread so concurrent fetches (e.g. the page's gather) keep the loop free
+        cached = await asyncio.to_thread(cache_service.get_fresh, cache_type, cache_key)
         if cached:
-            return {
-                **cached["data"],
-                "data_age": cache_service.get_age(cache_type, cache_key),
-                "is_fallback": False,
-            }
+            result = _tagged(cached["data"], cache_service.get_age(cache_type, cache_key), False)
+            self._memo_put(memo_key, result, cache_service.get_age_seconds(cache_type, cache_key) or 0.0)
+            return result
 
         # In background refresh mode, use stale data as fallback
         if config.BACKGROUND_REFRESH:
-            fallback = cache_service.get_stale(cache_type, cache_key)
+            fallback = await asyncio.to_thread(cache_service.get_stale, cache_type, cache_key)
             if fallback:
-                return {
-                    **fallback["data"],
-                    "data_age": cache_service.get_age(cache_type, cache_key),
-                    "is_fallback": True,
-                }
+                return _tagged(fallback["data"], cache_service.get_age(cache_type, cache_key), True)
             return None
 
-        # Fetch from API
+        # Stale-while-revalidate: recently expired data is served immediately
+        # while a background task refreshes it
+        age_seconds = cache_service.get_age_seconds(cache_type, cache_key)
+        if age_seconds is not None and age_seconds <= (config.CACHE_TTL_MINUTES + config.CACHE_SWR_MINUTES) * 60:
+            stale = await asyncio.to_thread(cache_service.get_stale, cache_type, cache_key)
+            if stale:
+                self._schedule_refresh(cache_type, cache_key, fetch_fn, error_prefix)
+                return _tagged(stale["data"], cache_service.get_age(cache_type, cache_key), False)
+
+        # Fetch from API. Concurrent misses for the same key (e.g. two sessions loading
+        # the same ticker) share one in-flight fetch instead of each calling the API
+        task = self._inflight.get(memo_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(cache_type, cache_key, fetch_fn, error_prefix))
+            self._inflight[memo_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(memo_key, None))
+        # Shielded so one caller going away doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self,
+        cache_type: str,
+        cache_key: str,
+        fetch_fn: Callable[[], Awaitable[dict]],
+        error_prefix: str
+    ) -> Optional[dict]:
+        """Fetch from the API and cache the result, falling back to stale cache on error."""
         try:
             data = await fetch_fn()
-            cache_service.set(cache_type, cache_key, data)
-            return {**data, "data_age": None, "is_fallback": False}
+            await asyncio.to_thread(cache_service.set, cache_type, cache_key, data)
+            result = _tagged(data, None, False)
+            self._memo_put((cache_type, cache_key), result)
+            return result
 
         except Exception as e:
-            logger.error(f"{error_prefix} | Request failed | {cache_key} | {e}")
+            logger.error("%s | Request failed | %s | %s", error_prefix, cache_key, e)
 
             # Try stale data as fallback on error
-            fallback = cache_service.get_stale(cache_type, cache_key)
+            fallback = await asyncio.to_thread(cache_service.get_stale, cache_type, cache_key)
             if fallback:
-                return {
-                    **fallback["data"],
-                    "data_age": cache_service.get_age(cache_type, cache_key),
-                    "is_fallback": True,
-                }
+                return _tagged(fallback["data"], cache_service.get_age(cache_type, cache_key), True)
+            return None
+
+    def _memo_get(self, key: tuple) -> Optional[dict]:
+        """Return a memoized result if it hasn't expired."""
+        entry = self._memo.get(key)
+        if entry is None:
             return None
 
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._memo[key]
+            return None
+
+        self._memo.move_to_end(key)
+        return result
+
+    def _memo_put(self, key: tuple, result: dict, age_seconds: float = 0.0) -> None:
+        """Memoize a fresh result, never past the point the file cache would call it stale."""
+        ttl = min(config.CACHE_MEMO_TTL_SECONDS, config.CACHE_TTL_MINUTES * 60 - age_seconds)
+        if ttl <= 0:
+            return
+
+        self._memo[key] = (time.monotonic() + ttl, result)
+        self._memo.move_to_end(key)
+        if len(self._memo) > config.CACHE_MEMO_MAX_ENTRIES:
+            self._memo.popitem(last=False)
+
+    def _schedule_refresh(
+        self,
+        cache_type: str,
+        cache_key: str,
+        fetch_fn: Callable[[], Awaitable[dict]],
+        error_prefix: str
+    ) -> None:
+        """Start a background cache refresh unless one is already running for this key."""
+        key = (cache_type, cache_key)
+        # No await between the check and the add, so concurrent callers coalesce into one refresh
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        task = asyncio.create_task(self._background_refresh(key, fetch_fn, error_prefix))
+        # Keep a reference so the task isn't garbage-collected mid-flight
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _background_refresh(
+        self,
+        key: tuple,
+        fetch_fn: Callable[[], Awaitable[dict]],
+        error_prefix: str
+    ) -> None:
+        """Fetch fresh data and update the cache, for stale-while-revalidate."""
+        cache_type, cache_key = key
+        try:
+            data = await fetch_fn()
+            await asyncio.to_thread(cache_service.set, cache_type, cache_key, data)
+            self._memo_put(key, _tagged(data, None, False))
+            logger.info("%s | Background refresh complete | %s", error_prefix, cache_key)
+        except Exception as e:
+            logger.warning("%s | Background refresh failed | %s | %s", error_prefix, cache_key, e)
+        finally:
+            self._refreshing.discard(key)
+
     async def get_stock_data(self, ticker: str) -> dict:
         """Get stock data with caching and fallback."""
         return await self._fetch_with_cache(
@@ -121,10 +227,17 @@ class DataService:
             error_prefix="NDH"
         )
 
-    async def get_insights(self, ticker: str, force_refresh: bool = False) -> dict:
+    async def get_insights(
+        self,
+        ticker: str,
+        force_refresh: bool = False,
+        price_data: Optional[dict] = None,
+        news_data: Optional[dict] = None,
+    ) -> dict:
         """
         Get AI insights with caching.
         Only regenerates on button click (force_refresh=True) in local mode.
+        Pass price_data/news_data when already loaded to avoid fetching them again.
         """
         cache_type = "insights"
 
@@ -144,8 +257,7 @@ class DataService:
 
         # Generate new insights
         try:
-            price_data = await self.get_stock_data(ticker)
-            news_data = await self.get_news(ticker)
+            price_data, news_data = await self._get_insight_inputs(ticker, price_data, news_data)
 
             if not price_data or not news_data:
                 logger.warning(f"OPENAI | Cannot generate insights | Missing data for {ticker}")
@@ -159,6 +271,53 @@ class DataService:
             logger.error(f"OPENAI | Request failed | {ticker} | {e}")
             return None
 
+    async def stream_insights(
+        self,
+        ticker: str,
+        price_data: Optional[dict] = None,
+        news_data: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate fresh AI insights, yielding text chunks as they arrive.
+        The completed insight is cached, like get_insights(force_refresh=True).
+        Yields nothing in background refresh mode or when data is missing.
+        """
+        if config.BACKGROUND_REFRESH:
+            return
+
+        price_data, news_data = await self._get_insight_inputs(ticker, price_data, news_data)
+
+        if not price_data or not news_data:
+            logger.warning(f"OPENAI | Cannot generate insights | Missing data for {ticker}")
+            return
+
+        try:
+            async for chunk in self.openai.generate_insights_stream(
+                ticker,
+                price_data,
+                news_data,
+                on_complete=lambda data: cache_service.set("insights", ticker, data),
+            ):
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"OPENAI | Request failed | {ticker} | {e}")
+
+    async def _get_insight_inputs(
+        self,
+        ticker: str,
+        price_data: Optional[dict],
+        news_data: Optional[dict],
+    ) -> tuple:
+        """Fetch whichever of price and news data wasn't provided, concurrently."""
+        if price_data is None and news_data is None:
+            return await asyncio.gather(self.get_stock_data(ticker), self.get_news(ticker))
+        if price_data is None:
+            price_data = await self.get_stock_data(ticker)
+        if news_data is None:
+            news_data = await self.get_news(ticker)
+        return price_data, news_data
+
     async def get_related_stocks(self, ticker: str) -> dict:
         """Get related stocks data with caching."""
         cache_type = "related"
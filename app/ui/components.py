@@ -1,12 +1,72 @@
 import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
 import asyncio
+import atexit
+import threading
 import time
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
 from app.config import config
 from app.services.data_service import data_service
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+STYLES_PATH = Path(__file__).parent / "styles.css"
+
+@st.cache_resource
+def _load_styles() -> str:
+    """Read the dashboard stylesheet once per process."""
+    return STYLES_PATH.read_text()
+
+def inject_styles():
+    """
+    Inject the dashboard stylesheet.
+
+    Streamlit removes elements a rerun doesn't re-emit, so this runs every rerun;
+    the markup is identical each time, so the browser has nothing to re-apply.
+    """
+    st.markdown(f"<style>{_load_styles()}</style>", unsafe_allow_html=True)
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Process-wide event loop running in a daemon thread, shared by every session.
+
+    One long-lived loop keeps pooled HTTP connections alive across reruns and lets
+    background cache refreshes keep running between page loads.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="dashboard-event-loop", daemon=True).start()
+    atexit.register(_shutdown_event_loop, loop)
+    return loop
+
+def _shutdown_event_loop(loop: asyncio.AbstractEventLoop):
+    """Close pooled API connections and stop the shared loop at process exit."""
+    try:
+        asyncio.run_coroutine_threadsafe(data_service.aclose(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+async def _anext(agen):
+    return await agen.__anext__()
+
+def iter_async(agen):
+    """Iterate an async generator from Streamlit's sync code on the shared event loop."""
+    try:
+        while True:
+            try:
+                yield run_async(_anext(agen))
+            except StopAsyncIteration:
+                return
+    finally:
+        run_async(agen.aclose())
+
 def render_header() -> str:
     """Render header with logo and ticker selector. Returns selected ticker."""
     col1, col2 = st.columns([1, 2])
@@ -17,23 +77,22 @@ def render_header() -> str:
         ticker = st.selectbox(
             "Select stock",
             options=config.TICKERS,
-            format_func=lambda t: f"{t} — {config.TICKER_INFO[t]['name']}",
+            format_func=config.TICKER_LABELS.get,
         )
 
     return ticker
 
 def render_stock_info(ticker: str, stock_data: dict):
     """Render ticker name and price with delta."""
-    info = config.TICKER_INFO[ticker]
+    meta = config.TICKER_META[ticker]
     current_price = stock_data.get("current_price")
     previous_close = stock_data.get("previous_close")
-    brand_color = info.get("brand_color", "#22c55e")
 
     col1, col2 = st.columns([1, 3])
 
     with col1:
-        st.markdown(f'<h2 style="color: {brand_color};">{ticker}</h2>', unsafe_allow_html=True)
-        st.caption(f"{info['name']} · {info['exchange']}")
+        st.markdown(f'<h2 style="color: {meta.brand_color};">{ticker}</h2>', unsafe_allow_html=True)
+        st.caption(meta.name_exchange)
 
     with col2:
         if current_price and previous_close:
@@ -49,15 +108,38 @@ def render_stock_info(ticker: str, stock_data: dict):
 
 def render_price_chart(stock_data: dict):
     """Render interactive price chart using Plotly."""
-    prices = stock_data.get("prices", [])
+    prices = stock_data.get("prices") or {}
 
-    if not prices:
+    # Hashable (date, close) pairs key the cached figure, so reruns reuse it
+    if isinstance(prices, list):
+        # Cache files written before prices became columnar
+        price_points = tuple((p["date"], p["close"]) for p in prices)
+    else:
+        price_points = tuple(zip(prices.get("date", []), prices.get("close", [])))
+
+    if not price_points:
         st.warning("No price data available for chart.")
         return
+    fig = _build_price_fig(
+        price_points,
+        stock_data.get("price_range_min"),
+        stock_data.get("price_range_max"),
+    )
 
-    # Convert to pandas for better date handling
-    dates = pd.to_datetime([p["date"] for p in prices])
-    closes = [p["close"] for p in prices]
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(ttl=config.CACHE_TTL_MINUTES * 60, show_spinner=False)
+def _build_price_fig(price_points: tuple, price_range_min, price_range_max) -> "go.Figure":
+    """Build the price history figure (cached until the price data changes)."""
+    # Imported here so pages that never draw the chart don't pay for loading them
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    # One columnar frame instead of per-field list comprehensions; plotly serializes
+    # the resulting arrays directly
+    df = pd.DataFrame.from_records(price_points, columns=["date", "close"])
+    dates = pd.to_datetime(df["date"], cache=True).to_numpy()
+    closes = df["close"].to_numpy()
 
     fig = go.Figure()
 
@@ -82,8 +164,6 @@ def render_price_chart(stock_data: dict):
     )
 
     # Set custom range if available
-    price_range_min = stock_data.get("price_range_min")
-    price_range_max = stock_data.get("price_range_max")
     if price_range_min is not None and price_range_max is not None:
         yaxis_config["range"] = [price_range_min, price_range_max]
 
@@ -104,68 +184,62 @@ def render_price_chart(stock_data: dict):
         ),
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def render_news_section(news_data: dict):
-    """Render news articles."""
+    """Render news articles (link styling comes from styles.css)."""
     articles = news_data.get("articles", [])
 
     if not articles:
         st.info("No recent news available.")
         return
 
-    # Apply link styling and reduce spacing
-    st.markdown(
-        """
-        <style>
-        div[data-testid="stMarkdownContainer"] a {
-            color: #fafafa !important;
-            text-decoration: none !important;
-        }
-        div[data-testid="stMarkdownContainer"] a:hover {
-            color: #22c55e !important;
-        }
-        div[data-testid="stMarkdownContainer"] p {
-            margin-bottom: 0.2rem !important;
-        }
-        div[data-testid="stCaptionContainer"] {
-            margin-top: 0 !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-    for article in articles:
-        title = article.get("title", "Untitled")
-        source = article.get("source_title", "Unknown")
-        pub_date = article.get("pub_date", "")
-        url = article.get("article_link", article.get("url", ""))
-
-        # Format date
-        if pub_date:
-            try:
-                dt = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                age = datetime.now(dt.tzinfo) - dt
-                if age.days > 0:
-                    time_ago = f"{age.days}d ago"
-                elif age.seconds >= 3600:
-                    time_ago = f"{age.seconds // 3600}h ago"
-                else:
-                    time_ago = f"{age.seconds // 60}m ago"
-            except Exception:
-                time_ago = ""
-        else:
-            time_ago = ""
-
+    # One clock read for the whole list
+    now = time.time()
+    for title, url, source, pub_ts in _format_articles(articles):
         # Render article
         if url:
             st.markdown(f"**[{title}]({url})**")
         else:
             st.markdown(f"**{title}**")
 
+        time_ago = _time_ago(now - pub_ts) if pub_ts is not None else ""
         st.caption(f"{source} · {time_ago}")
 
+@st.cache_data(ttl=config.CACHE_TTL_MINUTES * 60, show_spinner=False)
+def _format_articles(articles: list) -> list:
+    """
+    Format articles as (title, url, source, pub_ts) rows, cached until the news changes.
+    pub_ts is the publish time in epoch seconds, or None if unknown.
+    """
+    rows = []
+    for article in articles:
+        title = article.get("title", "Untitled")
+        source = article.get("source_title", "Unknown")
+        url = article.get("article_link", article.get("url", ""))
+
+        # _pub_ts is stored at fetch time; parse pub_date only for older cache files
+        pub_ts = article.get("_pub_ts")
+        if pub_ts is None and article.get("pub_date"):
+            try:
+                pub_ts = datetime.fromisoformat(article["pub_date"].replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pub_ts = None
+
+        rows.append((title, url, source, pub_ts))
+    return rows
+
+def _time_ago(age_seconds: float) -> str:
+    """Format an age in seconds as "3d ago", "5h ago" or "12m ago"."""
+    minutes = max(0, int(age_seconds)) // 60
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days > 0:
+        return f"{days}d ago"
+    if hours > 0:
+        return f"{hours}h ago"
+    return f"{minutes}m ago"
+
 def render_insights_section(ticker: str, stock_data: dict, news_data: dict):
     """Render AI insights with generate button."""
     # Header with button on same line
@@ -175,12 +249,37 @@ def render_insights_section(ticker: str, stock_data: dict, news_data: dict):
     with col2:
         generate_clicked = st.button("Generate", key="insights_btn")
 
-    # Check for cached insights
-    insights_data = asyncio.run(data_service.get_insights(ticker, force_refresh=False))
+    if generate_clicked and not config.BACKGROUND_REFRESH:
+        # Local mode: button streams a fresh insight from the API into a styled box,
+        # redrawing every INSIGHT_STREAM_RENDER_CHARS characters rather than per token.
+        # No get_insights() lookup first: on a cache miss it would run a full blocking
+        # completion, leaving the stream nothing to stream but a prompt-cache hit
+        parts = []
+        pending_chars = 0
+        placeholder = st.empty()
+        with st.spinner("Generating insights..."):
+            for chunk in iter_async(data_service.stream_insights(ticker, stock_data, news_data)):
+                parts.append(chunk)
+                pending_chars += len(chunk)
+                if pending_chars >= config.INSIGHT_STREAM_RENDER_CHARS:
+                    placeholder.markdown(_insight_box("".join(parts)), unsafe_allow_html=True)
+                    pending_chars = 0
+
+        accumulated_text = "".join(parts)
+        if pending_chars:
+            placeholder.markdown(_insight_box(accumulated_text), unsafe_allow_html=True)
+
+        insights_data = (
+            {"insight": accumulated_text, "data_age": None, "is_cached": False}
+            if accumulated_text else None
+        )
+    else:
+        # Check for cached insights (reuse the page's already-loaded data if generation is needed)
+        insights_data = run_async(data_service.get_insights(
+            ticker, force_refresh=False, price_data=stock_data, news_data=news_data
+        ))
 
-    # Handle button click
-    if generate_clicked:
-        if config.BACKGROUND_REFRESH:
+        if generate_clicked:
             # VPS mode: button shows cached, with toast
             if insights_data:
                 st.toast(
@@ -189,39 +288,13 @@ def render_insights_section(ticker: str, stock_data: dict, news_data: dict):
                 )
             else:
                 st.toast("No cached insights available", icon="⚠️")
-        else:
-            # Local mode: button triggers API call
-            with st.spinner("Generating insights..."):
-                insights_data = asyncio.run(data_service.get_insights(ticker, force_refresh=True))
 
     # Display insights
     if insights_data:
-        insight_text = insights_data.get("insight", "")
-
+        # Fresh insights were already streamed into their box above
         if insights_data.get("is_cached"):
             render_data_age_indicator("Insights", insights_data.get("data_age"))
-
-        # Stream effect for fresh insights, plain text for cached
-        # Display in custom styled box for visual emphasis
-        if insights_data.get("is_cached"):
-            st.markdown(
-                f'<div style="background-color: rgba(34, 197, 94, 0.1); '
-                f'border-left: 4px solid #22c55e; padding: 1rem; '
-                f'border-radius: 0.5rem; color: #fafafa;">{insight_text}</div>',
-                unsafe_allow_html=True
-            )
-        else:
-            # Stream into custom styled container
-            accumulated_text = ""
-            placeholder = st.empty()
-            for char in _stream_text(insight_text):
-                accumulated_text += char
-                placeholder.markdown(
-                    f'<div style="background-color: rgba(34, 197, 94, 0.1); '
-                    f'border-left: 4px solid #22c55e; padding: 1rem; '
-                    f'border-radius: 0.5rem; color: #fafafa;">{accumulated_text}</div>',
-                    unsafe_allow_html=True
-                )
+            st.markdown(_insight_box(insights_data.get("insight", "")), unsafe_allow_html=True)
 
         # Disclaimer below insights
         st.markdown("<br><br>", unsafe_allow_html=True)
@@ -229,11 +302,9 @@ def render_insights_section(ticker: str, stock_data: dict, news_data: dict):
     else:
         st.info("Click 'Generate Insights' to get AI analysis.")
 
-def _stream_text(text: str):
-    """Generator for streaming text effect."""
-    for char in text:
-        yield char
-        time.sleep(config.STREAMING_CHAR_DELAY)
+def _insight_box(text: str) -> str:
+    """Wrap insight text in the styled box (see .ai-insight in styles.css)."""
+    return f'<div class="ai-insight">{text}</div>'
 
 def render_data_age_indicator(section: str, age: str):
     """Render a small indicator showing data age."""
@@ -253,10 +324,8 @@ def render_related_stocks(related_data: dict):
             current = data.get("current", 0)
             change_pct = data.get("change_pct", 0)
 
-            # Get ticker info for name and exchange
-            info = config.TICKER_INFO.get(ticker, {})
-            name = info.get("name", ticker)
-            exchange = info.get("exchange", "")
+            # Precomputed name and exchange caption, if the ticker is known
+            meta = config.TICKER_META.get(ticker)
 
             # Larger ticker label
             st.markdown(f"**{ticker}**")
@@ -266,5 +335,5 @@ def render_related_stocks(related_data: dict):
                 delta=f"{change_pct:+.2f}%",
                 label_visibility="collapsed"
             )
-            if name and exchange:
-                st.caption(f"{name} · {exchange}")
+            if meta:
+                st.caption(meta.name_exchange)
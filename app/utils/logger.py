@@ -1,7 +1,9 @@
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from app.config import config
 
 def setup_logger() -> logging.Logger:
@@ -28,7 +30,6 @@ def setup_logger() -> logging.Logger:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
 
     # File handler with rotation
     file_handler = RotatingFileHandler(
@@ -38,7 +39,15 @@ def setup_logger() -> logging.Logger:
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Callers only enqueue records; a listener thread does the console/file writes
+    # and log rotation, so logging never blocks the event loop on I/O
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(listener.stop)
 
     return logger
 
@@ -62,6 +71,6 @@ def log_startup():
     logger.info(f"STARTUP | API Keys: {key_status}")
 
     # Check cache directory
-    cache_files = list(config.CACHE_DIR.glob("*.json")) if config.CACHE_DIR.exists() else []
+    cache_files = list(config.CACHE_DIR.glob("*.json*")) if config.CACHE_DIR.exists() else []
     logger.info(f"STARTUP | Cache directory: {config.CACHE_DIR} ({len(cache_files)} files)")
     logger.info("=" * 60)
@@ -1,9 +1,18 @@
 import asyncio
 import functools
+import random
+import httpx
 from typing import Tuple, Type
 from app.config import config
 from app.utils.logger import logger
 
+# Exception classes checked on every retry decision
+_NETWORK_ERRORS = (httpx.TimeoutException, httpx.ConnectError)
+_HTTP_STATUS_ERROR = httpx.HTTPStatusError
+
+# Polygon has 5 calls/minute (one call every 12s), so 429 retries never wait less than 15s
+_RATE_LIMIT_BASE_DELAY = 15.0
+
 def retry_with_backoff(
     max_retries: int = None,
     retry_on: Tuple[Type[Exception], ...] = (Exception,),
@@ -11,9 +20,9 @@ def retry_with_backoff(
     """
     Decorator that intercepts API errors and retries with intelligent backoff.
 
-    Retry Strategy:
-    - Transient errors (timeouts, 500s): Quick backoff (0.5s → 1s → 2s)
-    - Rate limits (429): Longer delays (15s per attempt)
+    Retry Strategy (decorrelated jitter, each delay capped at the fixed schedule):
+    - Transient errors (timeouts, 500s): Quick backoff, at most 0.5s, 1s, 2s
+    - Rate limits (429): Longer delays, never under 15s, at most 30s, 30s, 45s
     - Client errors (4xx except 429): No retry
 
     After all retries fail, calling code can fall back to stale cache.
@@ -25,6 +34,7 @@ def retry_with_backoff(
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             last_exception = None
+            prev_sleep = None
 
             for attempt in range(max_retries + 1):
                 try:
@@ -38,20 +48,23 @@ def retry_with_backoff(
                         raise
 
                     if attempt < max_retries:
-                        delay = _get_retry_delay(e, attempt, config.RETRY_BACKOFF_BASE)
+                        rate_limited = _is_429(e)
+                        delay = _get_retry_delay(e, prev_sleep, config.RETRY_BACKOFF_BASE, rate_limited, attempt)
+                        prev_sleep = delay
 
                         # Special logging for rate limits
-                        error_type = "Rate limit (429)" if hasattr(e, 'response') and getattr(e.response, 'status_code', None) == 429 else str(e)
+                        error_type = "Rate limit (429)" if rate_limited else e
 
+                        # %-style args defer formatting until a handler accepts the record
                         logger.warning(
-                            f"RETRY | {func.__name__} | Attempt {attempt + 1}/{max_retries + 1} | "
-                            f"Error: {error_type} | Backing off {delay:.1f}s"
+                            "RETRY | %s | Attempt %d/%d | Error: %s | Backing off %.1fs",
+                            func.__name__, attempt + 1, max_retries + 1, error_type, delay,
                         )
                         await asyncio.sleep(delay)
                     else:
                         logger.error(
-                            f"RETRY | {func.__name__} | All {max_retries + 1} attempts failed | "
-                            f"Last error: {e}"
+                            "RETRY | %s | All %d attempts failed | Last error: %s",
+                            func.__name__, max_retries + 1, e,
                         )
 
             raise last_exception
@@ -61,14 +74,12 @@ def retry_with_backoff(
 
 def _should_retry(exception: Exception) -> bool:
     """Determine if an exception warrants a retry."""
-    import httpx
-
     # Always retry network errors
-    if isinstance(exception, (httpx.TimeoutException, httpx.ConnectError)):
+    if isinstance(exception, _NETWORK_ERRORS):
         return True
 
     # Check HTTP status codes
-    if isinstance(exception, httpx.HTTPStatusError):
+    if isinstance(exception, _HTTP_STATUS_ERROR):
         status = exception.response.status_code
         # Retry on 429 (rate limit) and 5xx (server errors)
         if status == 429 or status >= 500:
@@ -79,26 +90,48 @@ def _should_retry(exception: Exception) -> bool:
     # Default: retry on unknown exceptions
     return True
 
-def _get_retry_delay(exception: Exception, attempt: int, base_delay: float) -> float:
+def _is_429(exception: Exception) -> bool:
+    """Check whether an exception is an HTTP 429 (rate limit) response."""
+    return isinstance(exception, _HTTP_STATUS_ERROR) and exception.response.status_code == 429
+
+def _get_retry_delay(
+    exception: Exception,
+    prev_sleep: float,
+    base_delay: float,
+    rate_limited: bool = None,
+    attempt: int = 0,
+) -> float:
     """
-    Calculate retry delay based on exception type and attempt number.
+    Calculate retry delay with decorrelated jitter: uniform(floor, prev_sleep * 3),
+    capped at the fixed schedule's delay for this attempt.
+
+    Randomizing each delay keeps clients that failed together (e.g. on a shared quota)
+    from all retrying at the same instant, while the cap keeps the worst case close to
+    the budget of the fixed schedule it replaced.
 
     For 429 rate limits (e.g., Polygon's 5 calls/minute):
-    - Retry 1: 15s delay
-    - Retry 2: 30s delay
-    - Retry 3: 45s delay
-    Total: 90s for all retries
+    - Never under 15s, capped at 15s * max(2, attempt + 1): 15-30s, then 15-30s, then
+      15-45s. The first retry gets a real range too, so clients rate-limited in the same
+      window don't all come back at the same instant
 
     For other transient errors (timeouts, 5xx):
-    - Standard exponential backoff: 0.5s, 1s, 2s
-    """
-    import httpx
-
-    # For 429 (rate limit), use longer delays to respect API quotas
-    if isinstance(exception, httpx.HTTPStatusError) and exception.response.status_code == 429:
-        # Polygon has 5 calls/minute (one call every 12s)
-        # Wait 15s between retries to avoid burning through quota
-        return 15 * (attempt + 1)
+    - Never under base_delay / 2, capped at base_delay * 2^attempt: 0.25-0.5s, then up
+      to 1s, then up to 2s by default
 
-    # For other errors, use standard exponential backoff
-    return base_delay * (2 ** attempt)
+    prev_sleep is the previous delay in this retry sequence (None on the first retry)
+    and attempt is the zero-based index of the failed attempt.
+    Pass rate_limited when the caller has already checked for a 429.
+    """
+    if rate_limited is None:
+        rate_limited = _is_429(exception)
+
+    if rate_limited:
+        floor = _RATE_LIMIT_BASE_DELAY
+        ceiling = _RATE_LIMIT_BASE_DELAY * max(2, attempt + 1)
+    else:
+        floor = base_delay / 2
+        ceiling = base_delay * (2 ** attempt)
+    ceiling = min(ceiling, config.RETRY_CAP_SECONDS)
+
+    upper = min(ceiling, max(floor, (prev_sleep or floor) * 3))
+    return random.uniform(min(floor, upper), upper)
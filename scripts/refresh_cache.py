@@ -16,14 +16,18 @@ from app.api.openai_client import OpenAIClient
 from app.services.cache import cache_service
 from app.utils.logger import logger
 
-async def refresh_ticker(ticker: str):
-    """Refresh all data for a single ticker."""
-    polygon = PolygonClient()
-    news = NewsDataHubClient()
-    openai = OpenAIClient()
-
+async def refresh_ticker(
+    ticker: str,
+    polygon: PolygonClient,
+    news: NewsDataHubClient,
+    openai: OpenAIClient,
+):
+    """Refresh all data for a single ticker using shared API clients."""
     logger.info(f"REFRESH | Starting refresh for {ticker}")
 
+    # Results are written in batches: market data before the OpenAI call, insights after
+    writes = {}
+
     # Fetch stock data, news, and related stocks in parallel
     try:
         stock_data, news_data, related_data = await asyncio.gather(
@@ -35,7 +39,7 @@ async def refresh_ticker(ticker: str):
 
         # Handle stock data
         if not isinstance(stock_data, Exception):
-            cache_service.set("polygon", ticker, stock_data)
+            writes[("polygon", ticker)] = stock_data
             logger.info(f"REFRESH | {ticker} | Stock data refreshed")
         else:
             logger.error(f"REFRESH | {ticker} | Stock data failed: {stock_data}")
@@ -43,7 +47,7 @@ async def refresh_ticker(ticker: str):
 
         # Handle news data
         if not isinstance(news_data, Exception):
-            cache_service.set("news", ticker, news_data)
+            writes[("news", ticker)] = news_data
             logger.info(f"REFRESH | {ticker} | News refreshed")
         else:
             logger.error(f"REFRESH | {ticker} | News failed: {news_data}")
@@ -51,16 +55,22 @@ async def refresh_ticker(ticker: str):
 
         # Handle related stocks data
         if not isinstance(related_data, Exception) and related_data:
-            cache_service.set("related", f"related_{ticker}", related_data)
+            writes[("related", f"related_{ticker}")] = related_data
             logger.info(f"REFRESH | {ticker} | Related stocks refreshed")
         elif isinstance(related_data, Exception):
             logger.error(f"REFRESH | {ticker} | Related stocks failed: {related_data}")
 
+        # Flush price, news and related data now, so a slow or failed insight call
+        # doesn't hold back fresh market data
+        if writes:
+            cache_service.set_many(writes)
+            writes.clear()
+
         # Generate insights (only if we have both stock and news data)
         if stock_data and news_data:
             try:
                 insights_data = await openai.generate_insights(ticker, stock_data, news_data)
-                cache_service.set("insights", ticker, insights_data)
+                writes[("insights", ticker)] = insights_data
                 logger.info(f"REFRESH | {ticker} | Insights refreshed")
             except Exception as e:
                 logger.error(f"REFRESH | {ticker} | Insights failed: {e}")
@@ -70,18 +80,41 @@ async def refresh_ticker(ticker: str):
     except Exception as e:
         logger.error(f"REFRESH | {ticker} | Unexpected error: {e}")
 
+    finally:
+        if writes:
+            cache_service.set_many(writes)
+
 async def main():
     """Refresh all tickers in parallel."""
     logger.info("=" * 60)
     logger.info("REFRESH | Starting background refresh job")
     logger.info("=" * 60)
 
+    # One set of clients (and connection pools) shared by every ticker; the shared
+    # PolygonClient's rate limiter spaces all tickers' Polygon calls within the quota
+    polygon = PolygonClient()
+    news = NewsDataHubClient()
+    openai = OpenAIClient()
+
     # Refresh all tickers in parallel
-    await asyncio.gather(*[refresh_ticker(ticker) for ticker in config.TICKERS])
+    try:
+        await asyncio.gather(*[
+            refresh_ticker(ticker, polygon, news, openai)
+            for ticker in config.TICKERS
+        ])
+    finally:
+        await asyncio.gather(polygon.aclose(), news.aclose(), openai.aclose())
 
     logger.info("=" * 60)
     logger.info("REFRESH | Background refresh complete")
     logger.info("=" * 60)
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -0,0 +1,7 @@
+import tempfile
+from pathlib import Path
+from app.config import config
+
+# app.utils.logger opens its log file on first import, before any fixture runs, so the
+# redirect happens here: test runs never write to (or leak request URLs into) logs/app.log
+config.LOG_DIR = Path(tempfile.mkdtemp(prefix="dashboard-test-logs-"))
@@ -1,5 +1,6 @@
 import pytest
 import json
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from app.services.cache import CacheService
@@ -70,3 +71,88 @@ def test_cache_fallback(cache_service, tmp_path):
     assert fallback is not None
     assert fallback["data"]["ticker"] == "AAPL"
     assert fallback["source"] == "fallback"
+
+def test_cache_cleanup_uses_mtime(cache_service, tmp_path):
+    """Test that cleanup removes files whose mtime is past CACHE_MAX_AGE_HOURS."""
+    import os
+
+    old_path = tmp_path / "test_OLD.json"
+    old_path.write_text("{}")
+    old_mtime = (datetime.now() - timedelta(hours=config.CACHE_MAX_AGE_HOURS + 1)).timestamp()
+    os.utime(old_path, (old_mtime, old_mtime))
+
+    cache_service.set("test", "AAPL", {"ticker": "AAPL"})
+
+    assert not old_path.exists()
+    assert (tmp_path / "test_AAPL.json").exists()
+
+def test_cache_stale_mtime_skips_parse(cache_service, tmp_path):
+    """Test that a file with an mtime past the TTL is a miss without being parsed."""
+    import os
+
+    cache_path = tmp_path / "test_AAPL.json"
+    cache_path.write_text("not json")
+    old_mtime = (datetime.now() - timedelta(minutes=config.CACHE_TTL_MINUTES + 1)).timestamp()
+    os.utime(cache_path, (old_mtime, old_mtime))
+
+    assert cache_service.get_fresh("test", "AAPL") is None
+    assert cache_service.get_age("test", "AAPL").endswith("m ago")
+
+def test_cache_compressed_roundtrip(cache_service, tmp_path, monkeypatch):
+    """Test that compressed cache files are written as .json.gz and read back."""
+    monkeypatch.setattr(config, "CACHE_COMPRESSION", True)
+    data = {"ticker": "AAPL", "price": 150.0}
+
+    cache_service.set("test", "AAPL", data)
+
+    assert (tmp_path / "test_AAPL.json.gz").exists()
+    assert cache_service.get_fresh("test", "AAPL")["data"] == data
+
+def test_cache_set_many(cache_service, tmp_path):
+    """Test that set_many writes every entry and leaves no temp files behind."""
+    cache_service.set_many({
+        ("polygon", "AAPL"): {"ticker": "AAPL", "price": 150.0},
+        ("news", "AAPL"): {"ticker": "AAPL", "articles": []},
+    })
+
+    assert cache_service.get_fresh("polygon", "AAPL")["data"]["price"] == 150.0
+    assert cache_service.get_fresh("news", "AAPL")["data"]["articles"] == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["news_AAPL.json", "polygon_AAPL.json"]
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_cache_files_use_umask_mode(cache_service, tmp_path):
+    """Test that cache files get the umask default mode, not mkstemp's private 0600."""
+    umask = os.umask(0)
+    os.umask(umask)
+
+    cache_service.set("polygon", "AAPL", {"price": 150.0})
+
+    mode = (tmp_path / "polygon_AAPL.json").stat().st_mode & 0o777
+    assert mode == 0o666 & ~umask
+
+def test_cache_set_many_concurrent_writers(cache_service, tmp_path):
+    """Test that threads writing the same entry at once don't collide on a temp file."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def write(i):
+        cache_service.set_many({("polygon", "AAPL"): {"ticker": "AAPL", "price": float(i)}})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(64)))
+
+    assert cache_service.get_fresh("polygon", "AAPL")["data"]["price"] in range(64)
+    assert [p.name for p in tmp_path.iterdir()] == ["polygon_AAPL.json"]
+
+def test_cache_corrupted_compressed_file(cache_service, tmp_path, monkeypatch):
+    """Test that a .json.gz file with a damaged compressed body is treated as a miss."""
+    import gzip
+
+    monkeypatch.setattr(config, "CACHE_COMPRESSION", True)
+
+    # Valid gzip header followed by a deflate block with the reserved block type,
+    # which zlib rejects with zlib.error rather than a gzip/EOF error
+    cache_path = tmp_path / "test_AAPL.json.gz"
+    cache_path.write_bytes(gzip.compress(b"")[:10] + b"\x07" + b"\x00" * 32)
+
+    assert cache_service.get_fresh("test", "AAPL") is None
+    assert cache_service.get_stale("test", "AAPL") is None
@@ -20,6 +20,11 @@ def test_config_tickers():
         assert ticker in config.TICKER_INFO
         assert "name" in config.TICKER_INFO[ticker]
         assert "exchange" in config.TICKER_INFO[ticker]
+        assert ticker in config.TICKER_LABELS
+        assert ticker in config.SEARCH_TERMS
+        assert config.TICKER_META[ticker].name_exchange == (
+            f"{config.TICKER_INFO[ticker]['name']} · {config.TICKER_INFO[ticker]['exchange']}"
+        )
 
 def test_config_env_override(monkeypatch):
     """Test that environment variables can be read by Config class."""
@@ -30,11 +35,12 @@ def test_config_env_override(monkeypatch):
     # Create new config instance that will read these env vars
     import importlib
     from app import config as config_module
+    # Put the original module attributes back afterwards; a second reload would still
+    # see the patched env, and every later `from app.config import config` would get it
+    monkeypatch.setattr(config_module, "config", config_module.config)
+    monkeypatch.setattr(config_module, "CACHE_TTL_SECONDS", config_module.CACHE_TTL_SECONDS)
     importlib.reload(config_module)
 
     # Test that config reads from environment
     assert config_module.config.CACHE_TTL_MINUTES == 180
     assert config_module.config.MAX_RETRIES == 5
-
-    # Reload again to restore defaults
-    importlib.reload(config_module)
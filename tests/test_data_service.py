@@ -0,0 +1,88 @@
+import os
+import asyncio
+import time
+import pytest
+from app.config import config
+from app.services.cache import cache_service
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Create a data service whose file cache lives in a temporary directory."""
+    # OpenAIClient refuses to construct without a key; these tests never send a request.
+    # Imported here, after the patch, because the module builds its singleton on import
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "test-key")
+    from app.services.data_service import DataService
+
+    monkeypatch.setattr(cache_service, "cache_dir", tmp_path)
+    monkeypatch.setattr(config, "BACKGROUND_REFRESH", False)
+    return DataService()
+
+class CountingFetch:
+    """Fake fetch_fn that counts its calls and yields to the loop like a real request."""
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls = 0
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.data
+
+def _write_cache(cache_type: str, key: str, data: dict, age_seconds: float) -> None:
+    """Write a cache entry and backdate its mtime by age_seconds."""
+    cache_service.set(cache_type, key, data)
+    path = cache_service._get_cache_path(cache_type, key)
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+
+async def test_concurrent_misses_share_one_fetch(service):
+    """Test that two gathered cache misses for the same key call the API once."""
+    fetch = CountingFetch({"price": 150.0})
+
+    first, second = await asyncio.gather(
+        service._fetch_with_cache("polygon", "AAPL", fetch, "TEST"),
+        service._fetch_with_cache("polygon", "AAPL", fetch, "TEST"),
+    )
+
+    assert fetch.calls == 1
+    assert first["price"] == second["price"] == 150.0
+    # Results are plain dicts, so callers can hand them straight back to the cache
+    cache_service.set("polygon", "AAPL_copy", first)
+    assert cache_service.get_fresh("polygon", "AAPL")["data"] == {"price": 150.0}
+
+async def test_swr_returns_stale_and_schedules_one_refresh(service):
+    """Test that an entry inside the SWR window is served stale while one refresh runs."""
+    _write_cache("polygon", "AAPL", {"price": 100.0}, (config.CACHE_TTL_MINUTES + 1) * 60)
+    fetch = CountingFetch({"price": 150.0})
+
+    first, second = await asyncio.gather(
+        service._fetch_with_cache("polygon", "AAPL", fetch, "TEST"),
+        service._fetch_with_cache("polygon", "AAPL", fetch, "TEST"),
+    )
+
+    assert first["price"] == second["price"] == 100.0
+    assert first["is_fallback"] is False
+    assert len(service._refresh_tasks) == 1
+
+    await asyncio.gather(*service._refresh_tasks)
+
+    assert fetch.calls == 1
+    assert cache_service.get_fresh("polygon", "AAPL")["data"] == {"price": 150.0}
+
+async def test_memo_expires_no_later_than_file_ttl(service, monkeypatch):
+    """Test that a memoized file-cache hit expires when the file would turn stale."""
+    remaining = 5.0
+    _write_cache("polygon", "AAPL", {"price": 100.0}, config.CACHE_TTL_MINUTES * 60 - remaining)
+    fetch = CountingFetch({"price": 150.0})
+
+    result = await service._fetch_with_cache("polygon", "AAPL", fetch, "TEST")
+
+    assert result["price"] == 100.0
+    expires_at, _ = service._memo[("polygon", "AAPL")]
+    assert expires_at <= time.monotonic() + remaining
+
+    # Once the file TTL has passed, the memo no longer answers
+    now = time.monotonic()
+    monkeypatch.setattr("app.services.data_service.time.monotonic", lambda: now + remaining)
+    assert service._memo_get(("polygon", "AAPL")) is None
+    assert fetch.calls == 0
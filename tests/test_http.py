@@ -0,0 +1,26 @@
+from app.utils.http import PayloadMemo
+
+def test_payload_memo_hit_and_miss():
+    """Test that a result is reused only for the same key and fingerprint."""
+    memo = PayloadMemo()
+    result = {"ticker": "AAPL"}
+
+    assert memo.put("AAPL", (2, "first", "last"), result) is result
+    assert memo.get("AAPL", (2, "first", "last")) is result
+    assert memo.get("AAPL", (3, "first", "newer")) is None
+    assert memo.get("TSLA", (2, "first", "last")) is None
+
+def test_payload_memo_put_replaces_entry():
+    """Test that storing a new fingerprint for a key replaces the previous result."""
+    memo = PayloadMemo()
+    memo.put("AAPL", b"old", {"v": 1})
+    memo.put("AAPL", b"new", {"v": 2})
+
+    assert memo.get("AAPL", b"old") is None
+    assert memo.get("AAPL", b"new") == {"v": 2}
+
+def test_payload_memo_digest():
+    """Test that the digest covers every body, in order."""
+    assert PayloadMemo.digest(b"page1", b"page2") == PayloadMemo.digest(b"page1", b"page2")
+    assert PayloadMemo.digest(b"page1", b"page2") != PayloadMemo.digest(b"page2", b"page1")
+    assert len(PayloadMemo.digest(b"payload")) == 16
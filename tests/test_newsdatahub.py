@@ -16,6 +16,76 @@ def test_newsdatahub_deduplicate_headlines():
     # Should keep only 2 articles (one duplicate removed)
     assert len(result) == 2
 
+def test_newsdatahub_deduplicate_punctuation_variants():
+    """Test that headlines differing only in case or punctuation are duplicates."""
+    client = NewsDataHubClient()
+
+    articles = [
+        {"title": "Apple releases new iPhone!", "source_title": "TechCrunch", "pub_date": "2024-01-01"},
+        {"title": "apple releases new iPhone", "source_title": "Reuters", "pub_date": "2024-01-02"},
+    ]
+
+    result = client._deduplicate_articles(articles)
+
+    assert len(result) == 1
+    assert result[0]["source_title"] == "Reuters"
+
+def test_newsdatahub_norm_title_unicode_variants():
+    """Test that Unicode compatibility forms and case variants share a dedup key."""
+    assert NewsDataHubClient._norm_title("Ｔｅｓｌａ Recalls  Cars") == NewsDataHubClient._norm_title("tesla recalls cars")
+    assert NewsDataHubClient._norm_title("STRASSE news") == NewsDataHubClient._norm_title("Straße news")
+    assert NewsDataHubClient._norm_title("Tesla’s recall — explained…") == NewsDataHubClient._norm_title("Tesla's recall - explained...")
+    assert NewsDataHubClient._norm_title("Tesla recalls cars") != NewsDataHubClient._norm_title("Tesla recalls trucks")
+
+@pytest.mark.parametrize("variant, plain", [
+    ("«Tesla» recalls cars", "Tesla recalls cars"),
+    ("Apple® unveils iPhone", "Apple unveils iPhone"),
+    ("Markets rally¡", "Markets rally"),
+    ("Tesla · Earnings · Q3", "Tesla Earnings Q3"),
+    ("Stocks fall 5€", "Stocks fall 5"),
+    ("「Sony」 shares jump", "Sony shares jump"),
+])
+def test_newsdatahub_norm_title_strips_symbols(variant, plain):
+    """Test that Unicode punctuation and symbols outside ASCII don't split duplicates."""
+    assert NewsDataHubClient._norm_title(variant) == NewsDataHubClient._norm_title(plain)
+
+def test_newsdatahub_norm_title_matches_non_word_regex():
+    """Test that headline normalization strips exactly what \\W stripped: marks yes, "_" no."""
+    import re
+    from app.api.newsdatahub import _punct_table
+
+    assert NewsDataHubClient._norm_title("Tesla\u0336 recalls") == NewsDataHubClient._norm_title("Tesla recalls")
+    assert NewsDataHubClient._norm_title("tesla_recalls") != NewsDataHubClient._norm_title("tesla recalls")
+
+    non_word = re.compile(r"\W")
+    table = _punct_table()
+    assert all(bool(non_word.match(chr(cp))) == (cp in table) for cp in range(0x10000))
+
+def test_newsdatahub_deduplicate_urls():
+    """Test that the same link republished under different titles is a duplicate."""
+    client = NewsDataHubClient()
+
+    articles = [
+        {"title": "Apple unveils iPhone", "source_title": "Yahoo", "pub_date": "2024-01-01",
+         "article_link": "https://www.example.com/apple-iphone/?utm_source=feed"},
+        {"title": "Apple's new iPhone is here", "source_title": "MSN", "pub_date": "2024-01-02",
+         "article_link": "http://EXAMPLE.com/apple-iphone"},
+        {"title": "Apple earnings", "source_title": "Reuters", "pub_date": "2024-01-03"},
+    ]
+
+    result = client._deduplicate_articles(articles)
+
+    assert [a["source_title"] for a in result] == ["Reuters", "MSN"]
+
+def test_newsdatahub_norm_url_canonical_form():
+    """Test that query param order and tracking params don't change a link's dedup key."""
+    norm = NewsDataHubClient._norm_url
+
+    assert norm("https://example.com/story?id=7&page=2") == norm("https://www.example.com/story/?page=2&utm_medium=x&id=7")
+    assert norm("https://example.com/story?id=7") != norm("https://example.com/story?id=8")
+    assert norm("https://example.com/a?b") != norm("https://example.com/a/b")
+    assert norm("not a url") is None
+
 def test_newsdatahub_deduplicate_sources():
     """Test that duplicate sources keep up to 2 freshest articles per source."""
     client = NewsDataHubClient()
@@ -36,6 +106,31 @@ def test_newsdatahub_deduplicate_sources():
     assert len(reuters_articles) == 2
     assert reuters_articles[0]["title"] == "Newer article"  # Newest first
 
+def test_newsdatahub_deduplicate_relevance_and_order():
+    """Test that irrelevant titles are dropped and results are freshest first."""
+    client = NewsDataHubClient()
+
+    articles = [
+        {"title": "Alphabet earnings beat", "source_title": "Reuters", "pub_date": "2024-01-01"},
+        {"title": "Oil prices slide", "source_title": "Bloomberg", "pub_date": "2024-01-03"},
+        {"title": "Google unveils new model", "source_title": "CNBC", "pub_date": "2024-01-02"},
+    ]
+
+    result = client._deduplicate_articles(articles, "Google OR Alphabet")
+
+    assert [a["title"] for a in result] == ["Google unveils new model", "Alphabet earnings beat"]
+
+def test_newsdatahub_deduplicate_single_article():
+    """Test that a single article still gets the relevance filter and parsed timestamp."""
+    client = NewsDataHubClient()
+
+    assert client._deduplicate_articles([], "Tesla") == []
+    assert client._deduplicate_articles([{"title": "Oil prices slide", "pub_date": "2024-01-01"}], "Tesla") == []
+
+    result = client._deduplicate_articles([{"title": "Tesla recalls cars", "pub_date": "2024-01-01"}], "Tesla")
+    assert len(result) == 1
+    assert result[0]["_pub_ts"] is not None
+
 def test_newsdatahub_quota_headers():
     """Test quota header parsing."""
     client = NewsDataHubClient()
@@ -51,3 +146,49 @@ def test_newsdatahub_quota_headers():
     assert client.quota_limit == 100
     assert client.quota_remaining == 50
     assert client.quota_reset == "2024-12-31T23:59:59Z"
+
+def test_newsdatahub_low_quota_paces_requests():
+    """Test that a low remaining quota sets a bounded minimum interval between calls."""
+    client = NewsDataHubClient()
+
+    client._update_quota_from_headers({
+        "X-RateLimit-Limit": "100",
+        "X-RateLimit-Remaining": "5",
+        "X-RateLimit-Reset": "20",
+    })
+    assert client._min_interval == 4.0
+
+    client._update_quota_from_headers({
+        "X-RateLimit-Limit": "100",
+        "X-RateLimit-Remaining": "50",
+        "X-RateLimit-Reset": "20",
+    })
+    assert client._min_interval == 0.0
+
+def test_newsdatahub_missing_quota_headers_keep_last_values():
+    """Test that responses without quota headers keep the last known quota."""
+    client = NewsDataHubClient()
+
+    client._update_quota_from_headers({"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "50"})
+    client._update_quota_from_headers({})
+
+    assert client.quota_limit == 100
+    assert client.quota_remaining == 50
+    assert client._min_interval == 0.0
+
+async def test_newsdatahub_pacing_spaces_concurrent_calls():
+    """Test that concurrent calls are spaced by the minimum interval, not released together."""
+    import asyncio
+    import time
+
+    client = NewsDataHubClient()
+    client._min_interval = 0.1
+
+    async def paced_call():
+        await client._pace()
+        return time.monotonic()
+
+    starts = sorted(await asyncio.gather(paced_call(), paced_call(), paced_call()))
+
+    assert starts[1] - starts[0] >= 0.09
+    assert starts[2] - starts[1] >= 0.09
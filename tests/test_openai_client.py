@@ -0,0 +1,120 @@
+import pytest
+from types import SimpleNamespace
+from app.config import config
+from app.api.openai_client import OpenAIClient
+
+PRICE_DATA = {"current_price": 110.0, "previous_close": 100.0}
+NEWS_DATA = {"articles": [{"title": "Tesla recalls cars", "source_title": "Reuters"}]}
+
+class FakeCompletions:
+    """Stands in for client.chat.completions, recording each create() call."""
+    def __init__(self, chunks=(), content="Analysis"):
+        self.chunks = list(chunks)
+        self.content = content
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            return self._stream()
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        )
+
+    async def _stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+def _delta(text: str) -> SimpleNamespace:
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+def _usage(prompt: int, completion: int) -> SimpleNamespace:
+    usage = SimpleNamespace(prompt_tokens=prompt, completion_tokens=completion, total_tokens=prompt + completion)
+    return SimpleNamespace(usage=usage, choices=[])
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Build an OpenAIClient whose completions endpoint is a FakeCompletions."""
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "test-key")
+
+    def make(completions: FakeCompletions) -> OpenAIClient:
+        client = OpenAIClient()
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return client
+
+    return make
+
+async def _collect(client, ticker="TSLA", on_complete=None) -> list:
+    return [chunk async for chunk in client.generate_insights_stream(ticker, PRICE_DATA, NEWS_DATA, on_complete)]
+
+async def test_stream_yields_deltas_and_records_usage(make_client):
+    """Test that deltas are yielded as they arrive and include_usage tokens are counted."""
+    completions = FakeCompletions([_delta("Momentum "), _delta(None), _delta("is strong."), _usage(40, 12)])
+    client = make_client(completions)
+    completed = []
+
+    chunks = await _collect(client, on_complete=completed.append)
+
+    assert chunks == ["Momentum ", "is strong."]
+    assert completions.calls[0]["stream_options"] == {"include_usage": True}
+    assert client.session_calls == 1
+    assert client.session_tokens == 52
+    # on_complete gets the same dict that was recorded in the prompt cache
+    assert completed == [{"ticker": "TSLA", "insight": "Momentum is strong.", "tokens_used": 52}]
+    assert [result for _, result in client._insight_cache.values()] == completed
+
+async def test_stream_empty_response_is_not_recorded(make_client):
+    """Test that a stream with no content skips the prompt cache and on_complete."""
+    client = make_client(FakeCompletions([_delta(None), _usage(40, 0)]))
+    completed = []
+
+    assert await _collect(client, on_complete=completed.append) == []
+    assert completed == []
+    assert len(client._insight_cache) == 0
+    assert client.session_calls == 0
+
+async def test_prompt_cache_hit_skips_api_call(make_client):
+    """Test that an identical prompt is answered from the in-process cache."""
+    completions = FakeCompletions(content="Momentum is strong.")
+    client = make_client(completions)
+
+    first = await client.generate_insights("TSLA", PRICE_DATA, NEWS_DATA)
+    second = await client.generate_insights("TSLA", PRICE_DATA, NEWS_DATA)
+
+    assert second is first
+    assert len(completions.calls) == 1
+
+async def test_prompt_cache_expires_after_ttl(make_client, monkeypatch):
+    """Test that a cached insight is regenerated once CACHE_TTL_MINUTES have passed."""
+    import app.api.openai_client as openai_client
+
+    now = 1000.0
+    monkeypatch.setattr(openai_client.time, "monotonic", lambda: now)
+    completions = FakeCompletions()
+    client = make_client(completions)
+
+    await client.generate_insights("TSLA", PRICE_DATA, NEWS_DATA)
+    now += config.CACHE_TTL_MINUTES * 60 - 1
+    await client.generate_insights("TSLA", PRICE_DATA, NEWS_DATA)
+    assert len(completions.calls) == 1
+
+    now += 1
+    await client.generate_insights("TSLA", PRICE_DATA, NEWS_DATA)
+    assert len(completions.calls) == 2
+
+async def test_prompt_cache_evicts_oldest_entry(make_client):
+    """Test that the LRU holds INSIGHT_CACHE_SIZE prompts and drops the oldest first."""
+    completions = FakeCompletions()
+    client = make_client(completions)
+    tickers = [f"T{i}" for i in range(OpenAIClient.INSIGHT_CACHE_SIZE + 1)]
+
+    for ticker in tickers:
+        await client.generate_insights(ticker, PRICE_DATA, NEWS_DATA)
+    assert len(client._insight_cache) == OpenAIClient.INSIGHT_CACHE_SIZE
+
+    # The newest prompts are still cached; the first one was evicted
+    await client.generate_insights(tickers[-1], PRICE_DATA, NEWS_DATA)
+    assert len(completions.calls) == len(tickers)
+    await client.generate_insights(tickers[0], PRICE_DATA, NEWS_DATA)
+    assert len(completions.calls) == len(tickers) + 1
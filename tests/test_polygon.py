@@ -31,11 +31,12 @@ def test_polygon_transform_response():
     result = client._transform_response(api_response, "AAPL")
 
     assert result["ticker"] == "AAPL"
-    assert len(result["prices"]) == 2
+    assert len(result["prices"]["close"]) == 2
     assert result["current_price"] == 152.0
     assert result["previous_close"] == 151.0
-    assert "date" in result["prices"][0]
-    assert result["prices"][0]["close"] == 151.0
+    assert len(result["prices"]["date"]) == 2
+    assert result["prices"]["close"][0] == 151.0
+    assert result["prices"]["volume"] == [1000000, 1100000]
 
 def test_polygon_transform_empty_results():
     """Test transformation with empty results."""
@@ -45,6 +46,128 @@ def test_polygon_transform_empty_results():
     result = client._transform_response(api_response, "AAPL")
 
     assert result["ticker"] == "AAPL"
-    assert result["prices"] == []
+    assert result["prices"]["close"] == []
+    assert result["prices"]["date"] == []
     assert result["current_price"] is None
     assert result["previous_close"] is None
+
+def test_polygon_transform_price_range():
+    """Test that the chart price range brackets the closes with a buffer."""
+    client = PolygonClient()
+
+    api_response = {
+        "results": [
+            {"t": 1700000000000, "o": 100.0, "h": 112.0, "l": 99.0, "c": 110.0, "v": 1000},
+            {"t": 1700086400000, "o": 110.0, "h": 111.0, "l": 99.0, "c": 100.0, "v": 1000},
+        ]
+    }
+
+    result = client._transform_response(api_response, "AAPL")
+
+    assert result["price_range_min"] == pytest.approx(99.0)
+    assert result["price_range_max"] == pytest.approx(111.0)
+
+async def test_polygon_rate_limiter_caps_calls_per_window():
+    """Test that concurrent callers get at most `calls` request starts per period."""
+    import asyncio
+    import time
+    from app.utils.http import RateLimiter
+
+    limiter = RateLimiter(2, 0.2)
+
+    async def limited_call():
+        await limiter.acquire()
+        return time.monotonic()
+
+    starts = sorted(await asyncio.gather(*(limited_call() for _ in range(5))))
+
+    # Any 3 consecutive starts span at least one full period
+    assert starts[2] - starts[0] >= 0.19
+    assert starts[4] - starts[2] >= 0.19
+
+async def test_polygon_related_stocks_grouped_bars(monkeypatch):
+    """Test the weekday walk-back, a partially failed batch, "T" parsing and the per-date memo."""
+    import httpx
+    from app.utils import retry
+    from app.utils.http import RateLimiter, SharedAsyncClient
+
+    grouped = {
+        "2024-03-06": [
+            {"T": "DIS", "t": 1709672400000, "c": 110.0},
+            {"T": "PARA", "t": 1709672400000, "c": 11.0},
+            {"T": "TSLA", "t": 1709672400000, "c": 176.0},
+            {"T": "AAPL", "t": 1709672400000, "c": 169.0},
+        ],
+        "2024-03-05": [
+            {"T": "DIS", "t": 1709586000000, "c": 100.0},
+            {"T": "PARA", "t": 1709586000000, "c": 10.0},
+            {"T": "TSLA", "t": 1709586000000, "c": 180.0},
+        ],
+    }
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        date = request.url.path.rsplit("/", 1)[-1]
+        requests.append(date)
+        if date == "2024-03-07":
+            return httpx.Response(500)
+        # 2024-03-08 has no bars yet, like a holiday or an unpublished day
+        return httpx.Response(200, json={"results": grouped.get(date, [])})
+
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+
+    client = PolygonClient()
+    client._http = SharedAsyncClient(transport=httpx.MockTransport(handler))
+    client._rate_limit = RateLimiter(0, 60.0)
+    dates = [datetime(2024, 3, day) for day in (8, 7, 6, 5, 4)]
+    monkeypatch.setattr(client, "_recent_weekdays", lambda days: list(dates))
+
+    result = await client.get_related_stocks(["DIS", "PARA", "WBD"])
+
+    assert result["DIS"] == {"current": 110.0, "change": 10.0, "change_pct": pytest.approx(10.0)}
+    assert result["PARA"]["current"] == 11.0
+    assert "WBD" not in result
+    # Walked back past the empty day and the failed one, never past the two found days
+    assert "2024-03-04" not in requests
+    assert requests.count("2024-03-06") == 1 and requests.count("2024-03-05") == 1
+
+    # Another ticker page reuses the memoized days instead of downloading them again
+    result = await client.get_related_stocks(["TSLA", "META", "AMZN"])
+
+    assert result["TSLA"]["change"] == pytest.approx(-4.0)
+    assert requests.count("2024-03-06") == 1 and requests.count("2024-03-05") == 1
+
+async def test_polygon_stock_data_reuses_transform_for_same_bars():
+    """Test that payloads differing only in request_id reuse the transformed result."""
+    import httpx
+    from app.utils.http import RateLimiter, SharedAsyncClient
+
+    bars = [
+        {"t": 1700000000000, "o": 150.0, "h": 152.0, "l": 149.0, "c": 151.0, "v": 1000000},
+        {"t": 1700086400000, "o": 151.0, "h": 153.0, "l": 150.0, "c": 152.0, "v": 1100000},
+    ]
+    payloads = [
+        {"request_id": "a1", "results": bars},
+        {"request_id": "b2", "results": list(bars)},
+        {"request_id": "c3", "results": bars + [
+            {"t": 1700172800000, "o": 152.0, "h": 155.0, "l": 151.0, "c": 154.0, "v": 900000},
+        ]},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=payloads.pop(0))
+
+    client = PolygonClient()
+    client._http = SharedAsyncClient(transport=httpx.MockTransport(handler))
+    client._rate_limit = RateLimiter(0, 60.0)
+
+    first = await client.get_stock_data("AAPL")
+    second = await client.get_stock_data("AAPL")
+    third = await client.get_stock_data("AAPL")
+
+    assert second is first
+    assert third is not first
+    assert third["current_price"] == 154.0
@@ -0,0 +1,78 @@
+import httpx
+import pytest
+from app.config import config
+from app.utils import retry
+from app.utils.retry import retry_with_backoff, _get_retry_delay
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+def _delays(exception, retries=3):
+    """Collect the delays of a full retry sequence for one error class."""
+    delays = []
+    prev_sleep = None
+    for attempt in range(retries):
+        prev_sleep = _get_retry_delay(exception, prev_sleep, 0.5, attempt=attempt)
+        delays.append(prev_sleep)
+    return delays
+
+@pytest.mark.parametrize("exception, ceilings", [
+    (_status_error(429), [30.0, 30.0, 45.0]),
+    (_status_error(503), [0.5, 1.0, 2.0]),
+    (httpx.ConnectTimeout("timeout"), [0.5, 1.0, 2.0]),
+])
+def test_retry_delay_upper_bounds(monkeypatch, exception, ceilings):
+    """Worst-case jitter never exceeds the fixed schedule, per delay or in total."""
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: high)
+
+    delays = _delays(exception)
+
+    assert all(delay <= ceiling for delay, ceiling in zip(delays, ceilings))
+    assert sum(delays) <= sum(ceilings)
+
+@pytest.mark.parametrize("exception, floor", [
+    (_status_error(429), 15.0),
+    (_status_error(500), 0.25),
+])
+def test_retry_delay_lower_bounds(monkeypatch, exception, floor):
+    """Best-case jitter still waits at least the floor for the error class."""
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: low)
+
+    assert all(delay >= floor for delay in _delays(exception))
+
+@pytest.mark.parametrize("exception, floor, ceiling", [
+    (_status_error(429), 15.0, 30.0),
+    (_status_error(502), 0.25, 0.5),
+])
+def test_retry_first_delay_is_jittered(exception, floor, ceiling):
+    """First-retry delays vary between clients, within the floor and cap."""
+    random_state = retry.random.getstate()
+    retry.random.seed(1234)
+    try:
+        delays = [_get_retry_delay(exception, None, 0.5, attempt=0) for _ in range(50)]
+    finally:
+        retry.random.setstate(random_state)
+
+    assert len(set(delays)) > 1
+    assert all(floor <= delay <= ceiling for delay in delays)
+
+async def test_retry_decorator_sleeps_within_bounds(monkeypatch):
+    """A 429 retried MAX_RETRIES times sleeps within each attempt's floor and cap."""
+    monkeypatch.setattr(config, "MAX_RETRIES", 3)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+
+    @retry_with_backoff(retry_on=(httpx.HTTPError,))
+    async def rate_limited():
+        raise _status_error(429)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await rate_limited()
+
+    assert len(sleeps) == 3
+    assert all(15.0 <= delay <= cap for delay, cap in zip(sleeps, [30.0, 30.0, 45.0]))